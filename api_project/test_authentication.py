@@ -3,6 +3,7 @@ import os
 import sys
 import django
 import json
+import logging
 
 # Add current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -10,6 +11,11 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # Setup Django environment
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_project.settings')
 
+# Plain message format keeps the console output identical to the old prints;
+# set LOGLEVEL=WARNING to silence the progress lines on quiet CI runs.
+logging.basicConfig(level=os.environ.get('LOGLEVEL', 'INFO'), format='%(message)s')
+logger = logging.getLogger(__name__)
+
 try:
     django.setup()
     
@@ -18,13 +24,13 @@ try:
     from django.contrib.auth.models import User
     from rest_framework.authtoken.models import Token
 except Exception as e:
-    print(f"❌ Error setting up Django: {e}")
+    logger.error("❌ Error setting up Django: %s", e)
     sys.exit(1)
 
 def test_authentication():
     """Test authentication and permissions on the BookViewSet"""
-    print("🔐 Testing Authentication and Permissions")
-    print("=" * 60)
+    logger.info("🔐 Testing Authentication and Permissions")
+    logger.info("=" * 60)
     
     client = Client()
     base_url = '/api'
@@ -37,20 +43,20 @@ def test_authentication():
     
     try:
         # 1. TEST UNAUTHENTICATED ACCESS TO PROTECTED ENDPOINTS
-        print("\n1. 🚫 Testing Unauthenticated Access")
-        print("-" * 40)
+        logger.info("\n1. 🚫 Testing Unauthenticated Access")
+        logger.info("-" * 40)
         
         # Try to access books_all without authentication
         response = client.get(f'{base_url}/books_all/')
         if response.status_code == 401:
-            print("✅ Unauthenticated access correctly blocked")
+            logger.info("✅ Unauthenticated access correctly blocked")
         else:
-            print(f"❌ Expected 401, got {response.status_code}")
+            logger.error("❌ Expected 401, got %s", response.status_code)
             return False
         
         # 2. TEST TOKEN AUTHENTICATION
-        print("\n2. 🔑 Testing Token Authentication")
-        print("-" * 40)
+        logger.info("\n2. 🔑 Testing Token Authentication")
+        logger.info("-" * 40)
         
         # Get or create test user and token
         user, created = User.objects.get_or_create(
@@ -70,16 +76,16 @@ def test_authentication():
         )
         
         if response.status_code == 200:
-            print("✅ Token authentication successful")
+            logger.info("✅ Token authentication successful")
             books = response.json()
-            print(f"   Retrieved {len(books)} books with token")
+            logger.info("   Retrieved %d books with token", len(books))
         else:
-            print(f"❌ Token authentication failed - Status: {response.status_code}")
+            logger.error("❌ Token authentication failed - Status: %s", response.status_code)
             return False
         
         # 3. TEST PERMISSIONS FOR REGULAR USER (READ-ONLY)
-        print("\n3. 👤 Testing Regular User Permissions (Read-Only)")
-        print("-" * 40)
+        logger.info("\n3. 👤 Testing Regular User Permissions (Read-Only)")
+        logger.info("-" * 40)
         
         # Try to create a book as regular user (should fail)
         response = client.post(
@@ -90,14 +96,14 @@ def test_authentication():
         )
         
         if response.status_code == 403:
-            print("✅ Regular user correctly blocked from creating books")
+            logger.info("✅ Regular user correctly blocked from creating books")
         else:
-            print(f"❌ Expected 403 for regular user, got {response.status_code}")
+            logger.error("❌ Expected 403 for regular user, got %s", response.status_code)
             return False
         
         # 4. TEST ADMIN USER PERMISSIONS (FULL ACCESS)
-        print("\n4. 👑 Testing Admin User Permissions (Full Access)")
-        print("-" * 40)
+        logger.info("\n4. 👑 Testing Admin User Permissions (Full Access)")
+        logger.info("-" * 40)
         
         # Get or create admin user
         admin_user, created = User.objects.get_or_create(
@@ -121,28 +127,28 @@ def test_authentication():
         if response.status_code == 201:
             created_book = response.json()
             book_id = created_book['id']
-            print("✅ Admin user successfully created a book")
-            print(f"   Created book ID: {book_id}")
+            logger.info("✅ Admin user successfully created a book")
+            logger.info("   Created book ID: %s", book_id)
         else:
-            print(f"❌ Admin user failed to create book - Status: {response.status_code}")
+            logger.error("❌ Admin user failed to create book - Status: %s", response.status_code)
             return False
         
         # 5. TEST PUBLIC ACCESS TO BOOKS ENDPOINT
-        print("\n5. 🌐 Testing Public Access to /books/ endpoint")
-        print("-" * 40)
+        logger.info("\n5. 🌐 Testing Public Access to /books/ endpoint")
+        logger.info("-" * 40)
         
         response = client.get(f'{base_url}/books/')
         if response.status_code == 200:
             books = response.json()
-            print("✅ Public books endpoint accessible without authentication")
-            print(f"   Retrieved {len(books)} books")
+            logger.info("✅ Public books endpoint accessible without authentication")
+            logger.info("   Retrieved %d books", len(books))
         else:
-            print(f"❌ Public books endpoint failed - Status: {response.status_code}")
+            logger.error("❌ Public books endpoint failed - Status: %s", response.status_code)
             return False
         
         # 6. TEST TOKEN OBTAIN ENDPOINT
-        print("\n6. 🎫 Testing Token Obtain Endpoint")
-        print("-" * 40)
+        logger.info("\n6. 🎫 Testing Token Obtain Endpoint")
+        logger.info("-" * 40)
         
         response = client.post(
             f'{base_url}/auth-token/',
@@ -152,25 +158,23 @@ def test_authentication():
         
         if response.status_code == 200:
             token_data = response.json()
-            print("✅ Token obtain endpoint working")
-            print(f"   Received token: {token_data['token'][:10]}...")
+            logger.info("✅ Token obtain endpoint working")
+            logger.info("   Received token: %s...", token_data['token'][:10])
         else:
-            print(f"❌ Token obtain failed - Status: {response.status_code}")
+            logger.error("❌ Token obtain failed - Status: %s", response.status_code)
         
-        print("\n" + "=" * 60)
-        print("🎉 ALL AUTHENTICATION TESTS PASSED!")
+        logger.info("\n%s", "=" * 60)
+        logger.info("🎉 ALL AUTHENTICATION TESTS PASSED!")
         return True
         
     except Exception as e:
-        print(f"❌ Error during authentication testing: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error during authentication testing: %s", e)
         return False
 
 def show_authentication_endpoints():
     """Display authentication-related endpoints"""
-    print("\n🔐 Authentication Endpoints:")
-    print("-" * 40)
+    logger.info("\n🔐 Authentication Endpoints:")
+    logger.info("-" * 40)
     base_url = "http://127.0.0.1:8000/api"
     
     endpoints = [
@@ -181,21 +185,21 @@ def show_authentication_endpoints():
     ]
     
     for method, url, description in endpoints:
-        print(f"{method} {url:<35} {description}")
+        logger.info("%s %-35s %s", method, url, description)
     
-    print("\n👥 Sample Users (after running create_users):")
-    print("   Admin:  username='admin'  password='admin123'")
-    print("   User:   username='user'   password='user123'")
+    logger.info("\n👥 Sample Users (after running create_users):")
+    logger.info("   Admin:  username='admin'  password='admin123'")
+    logger.info("   User:   username='user'   password='user123'")
 
 if __name__ == "__main__":
     show_authentication_endpoints()
-    print("\n")
+    logger.info("\n")
     if test_authentication():
-        print("\n🚀 Authentication Implementation Complete!")
-        print("\n💡 Next steps:")
-        print("   1. Run 'python manage.py create_users' to create sample users")
-        print("   2. Use the tokens in your API requests")
-        print("   3. Test with different user roles")
+        logger.info("\n🚀 Authentication Implementation Complete!")
+        logger.info("\n💡 Next steps:")
+        logger.info("   1. Run 'python manage.py create_users' to create sample users")
+        logger.info("   2. Use the tokens in your API requests")
+        logger.info("   3. Test with different user roles")
     else:
-        print("\n❌ Authentication Testing Failed!")
+        logger.error("\n❌ Authentication Testing Failed!")
         sys.exit(1)
\ No newline at end of file
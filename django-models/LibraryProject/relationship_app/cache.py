@@ -0,0 +1,48 @@
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Author, Book, Librarian, Library
+
+# The book and library lists are shared by every user and rebuilt at most once
+# a minute; any write to the tables they show drops them straight away
+LIST_CACHE_TIMEOUT = 60
+BOOK_LIST_KEY = 'relationship_app:book_list'
+LIBRARY_LIST_KEY = 'relationship_app:library_list'
+
+def get_book_list():
+    """All books with their authors"""
+    return cache.get_or_set(
+        BOOK_LIST_KEY,
+        lambda: list(Book.objects.all().select_related('author')),
+        LIST_CACHE_TIMEOUT
+    )
+
+def get_library_list():
+    """All libraries with their librarian and book count"""
+    return cache.get_or_set(
+        LIBRARY_LIST_KEY,
+        # Join the librarian and count books in the same query instead of per row
+        lambda: list(Library.objects.select_related('librarian').annotate(book_count=Count('books'))),
+        LIST_CACHE_TIMEOUT
+    )
+
+def clear_list_cache():
+    cache.delete_many([BOOK_LIST_KEY, LIBRARY_LIST_KEY])
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=Library)
+@receiver(post_delete, sender=Library)
+@receiver(post_save, sender=Librarian)
+@receiver(post_delete, sender=Librarian)
+def invalidate_lists_on_save(sender, **kwargs):
+    clear_list_cache()
+
+@receiver(m2m_changed, sender=Library.books.through)
+def invalidate_lists_on_m2m_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        clear_list_cache()
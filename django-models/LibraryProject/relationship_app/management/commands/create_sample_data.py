@@ -6,23 +6,56 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         # Create sample data (same as in query_samples.py)
-        author1 = Author.objects.create(name="George Orwell")
-        author2 = Author.objects.create(name="J.K. Rowling")
-        author3 = Author.objects.create(name="J.R.R. Tolkien")
-        
-        book1 = Book.objects.create(title="1984", author=author1)
-        book2 = Book.objects.create(title="Animal Farm", author=author1)
-        book3 = Book.objects.create(title="Harry Potter and the Sorcerer's Stone", author=author2)
-        book4 = Book.objects.create(title="The Hobbit", author=author3)
-        book5 = Book.objects.create(title="The Lord of the Rings", author=author3)
-        
-        library1 = Library.objects.create(name="Central Library")
-        library2 = Library.objects.create(name="City Public Library")
-        
-        library1.books.add(book1, book2, book3)
-        library2.books.add(book3, book4, book5)
-        
-        Librarian.objects.create(name="Alice Johnson", library=library1)
-        Librarian.objects.create(name="Bob Smith", library=library2)
-        
+        # Every insert uses ignore_conflicts against the unique constraints on
+        # the models, so the command can be re-run without flushing the DB.
+        author_names = ["George Orwell", "J.K. Rowling", "J.R.R. Tolkien"]
+        Author.objects.bulk_create(
+            [Author(name=name) for name in author_names],
+            ignore_conflicts=True,
+        )
+        authors = {a.name: a for a in Author.objects.filter(name__in=author_names)}
+
+        book_titles = [
+            ("1984", "George Orwell"),
+            ("Animal Farm", "George Orwell"),
+            ("Harry Potter and the Sorcerer's Stone", "J.K. Rowling"),
+            ("The Hobbit", "J.R.R. Tolkien"),
+            ("The Lord of the Rings", "J.R.R. Tolkien"),
+        ]
+        Book.objects.bulk_create(
+            [Book(title=title, author=authors[name]) for title, name in book_titles],
+            ignore_conflicts=True,
+        )
+        books = {b.title: b for b in Book.objects.filter(author__in=authors.values())}
+
+        library_names = ["Central Library", "City Public Library"]
+        Library.objects.bulk_create(
+            [Library(name=name) for name in library_names],
+            ignore_conflicts=True,
+        )
+        libraries = {l.name: l for l in Library.objects.filter(name__in=library_names)}
+
+        # Write the M2M through rows directly so both libraries share one INSERT
+        library_books = {
+            "Central Library": ["1984", "Animal Farm", "Harry Potter and the Sorcerer's Stone"],
+            "City Public Library": ["Harry Potter and the Sorcerer's Stone", "The Hobbit", "The Lord of the Rings"],
+        }
+        LibraryBooks = Library.books.through
+        LibraryBooks.objects.bulk_create(
+            [
+                LibraryBooks(library=libraries[library_name], book=books[title])
+                for library_name, titles in library_books.items()
+                for title in titles
+            ],
+            ignore_conflicts=True,
+        )
+
+        Librarian.objects.bulk_create(
+            [
+                Librarian(name="Alice Johnson", library=libraries["Central Library"]),
+                Librarian(name="Bob Smith", library=libraries["City Public Library"]),
+            ],
+            ignore_conflicts=True,
+        )
+
         self.stdout.write(self.style.SUCCESS('Sample data created successfully!'))
\ No newline at end of file
@@ -0,0 +1,17 @@
+from django.utils.functional import SimpleLazyObject
+
+class PermissionCacheMiddleware:
+    """
+    Attach the user's permission set to the request as request.user_perms.
+
+    The set is loaded on first use with a single get_all_permissions() call,
+    which also fills ModelBackend's per-user cache, so later has_perm() checks
+    (including @permission_required) are answered from memory.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.user_perms = SimpleLazyObject(lambda: request.user.get_all_permissions())
+        return self.get_response(request)
@@ -0,0 +1,72 @@
+# Generated by Django 4.2.30 on 2026-10-16 12:25
+
+from django.db import migrations, models
+
+
+def duplicates(queryset, *fields):
+    """(keeper id, [duplicate ids]) for each group of rows sharing fields; the oldest row is kept"""
+    groups = {}
+    for row in queryset.order_by('pk').values('pk', *fields):
+        groups.setdefault(tuple(row[field] for field in fields), []).append(row['pk'])
+    return [(pks[0], pks[1:]) for pks in groups.values() if len(pks) > 1]
+
+
+def merge_duplicate_sample_data(apps, schema_editor):
+    """
+    Collapse the rows that repeated runs of create_sample_data left behind, so
+    the unique constraints below can be added: books move to the kept author,
+    library memberships to the kept book and library, and a duplicate library's
+    librarian moves over only if the kept library has none.
+    """
+    Author = apps.get_model('relationship_app', 'Author')
+    Book = apps.get_model('relationship_app', 'Book')
+    Library = apps.get_model('relationship_app', 'Library')
+    Librarian = apps.get_model('relationship_app', 'Librarian')
+    LibraryBooks = Library.books.through
+    
+    for keeper, extra in duplicates(Author.objects, 'name'):
+        Book.objects.filter(author_id__in=extra).update(author_id=keeper)
+        Author.objects.filter(pk__in=extra).delete()
+    
+    for keeper, extra in duplicates(Book.objects, 'title', 'author_id'):
+        library_ids = set(LibraryBooks.objects.filter(book_id__in=extra).values_list('library_id', flat=True))
+        for library_id in library_ids:
+            LibraryBooks.objects.get_or_create(library_id=library_id, book_id=keeper)
+        Book.objects.filter(pk__in=extra).delete()
+    
+    for keeper, extra in duplicates(Library.objects, 'name'):
+        book_ids = set(LibraryBooks.objects.filter(library_id__in=extra).values_list('book_id', flat=True))
+        for book_id in book_ids:
+            LibraryBooks.objects.get_or_create(library_id=keeper, book_id=book_id)
+        if not Librarian.objects.filter(library_id=keeper).exists():
+            moved = Librarian.objects.filter(library_id__in=extra).order_by('pk').first()
+            if moved is not None:
+                moved.library_id = keeper
+                moved.save(update_fields=['library'])
+        # Cascades to the duplicates' remaining librarians and memberships
+        Library.objects.filter(pk__in=extra).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relationship_app', '0003_alter_book_options_alter_library_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_sample_data, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='author',
+            name='name',
+            field=models.CharField(max_length=100, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='library',
+            name='name',
+            field=models.CharField(max_length=100, unique=True),
+        ),
+        migrations.AlterUniqueTogether(
+            name='book',
+            unique_together={('title', 'author')},
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-16 12:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relationship_app', '0004_unique_sample_data_names'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['role'], name='relationshi_role_eba9aa_idx'),
+        ),
+    ]
@@ -4,16 +4,25 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 class Author(models.Model):
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, unique=True)
     
     def __str__(self):
         return self.name
 
+class BookQuerySet(models.QuerySet):
+    def by_author_name(self, name, **filters):
+        # Keep every author criterion in one filter() call: chaining another
+        # .filter(author__...) would add a second JOIN on the author table
+        return self.filter(author__name=name, **filters)
+
 class Book(models.Model):
     title = models.CharField(max_length=200)
     author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='books')
     
+    objects = BookQuerySet.as_manager()
+    
     class Meta:
+        unique_together = ['title', 'author']  # Lets create_sample_data skip existing rows
         permissions = [
             ("can_add_book", "Can add book"),
             ("can_change_book", "Can change book"),
@@ -24,7 +33,7 @@ class Book(models.Model):
         return f"{self.title} by {self.author.name}"
 
 class Library(models.Model):
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, unique=True)
     books = models.ManyToManyField(Book, related_name='libraries')
     
     class Meta:
@@ -52,6 +61,9 @@ class UserProfile(models.Model):
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='member')
     
     class Meta:
+        indexes = [
+            models.Index(fields=['role']),
+        ]
         permissions = [
             ("can_manage_roles", "Can manage user roles"),
         ]
@@ -12,81 +12,138 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'LibraryProject.settings')
 django.setup()
 
+from django.db.models import Prefetch
+
 from relationship_app.models import Author, Book, Library, Librarian
 
 def create_sample_data():
     """Create sample data for testing relationships"""
     print("=== Creating Sample Data ===")
     
-    # Create authors
-    author1 = Author.objects.create(name="George Orwell")
-    author2 = Author.objects.create(name="J.K. Rowling")
-    author3 = Author.objects.create(name="J.R.R. Tolkien")
+    # One INSERT per table; ignore_conflicts skips rows the unique constraints
+    # already hold, so the script can be re-run. Rows are re-read by name,
+    # since SQLite does not return the ids of rows inserted this way
+    author_names = ["George Orwell", "J.K. Rowling", "J.R.R. Tolkien"]
+    Author.objects.bulk_create([Author(name=name) for name in author_names], ignore_conflicts=True)
+    authors = Author.objects.in_bulk(author_names, field_name='name')
     
     # Create books
-    book1 = Book.objects.create(title="1984", author=author1)
-    book2 = Book.objects.create(title="Animal Farm", author=author1)
-    book3 = Book.objects.create(title="Harry Potter and the Sorcerer's Stone", author=author2)
-    book4 = Book.objects.create(title="The Hobbit", author=author3)
-    book5 = Book.objects.create(title="The Lord of the Rings", author=author3)
+    book_authors = [
+        ("1984", "George Orwell"),
+        ("Animal Farm", "George Orwell"),
+        ("Harry Potter and the Sorcerer's Stone", "J.K. Rowling"),
+        ("The Hobbit", "J.R.R. Tolkien"),
+        ("The Lord of the Rings", "J.R.R. Tolkien"),
+    ]
+    Book.objects.bulk_create(
+        [Book(title=title, author=authors[name]) for title, name in book_authors],
+        ignore_conflicts=True
+    )
+    books = {book.title: book for book in Book.objects.filter(author__in=authors.values())}
     
     # Create libraries
-    library1 = Library.objects.create(name="Central Library")
-    library2 = Library.objects.create(name="City Public Library")
-    
-    # Add books to libraries
-    library1.books.add(book1, book2, book3)
-    library2.books.add(book3, book4, book5)
-    
-    # Create librarians
-    librarian1 = Librarian.objects.create(name="Alice Johnson", library=library1)
-    librarian2 = Librarian.objects.create(name="Bob Smith", library=library2)
+    library_names = ["Central Library", "City Public Library"]
+    Library.objects.bulk_create([Library(name=name) for name in library_names], ignore_conflicts=True)
+    libraries = Library.objects.in_bulk(library_names, field_name='name')
+    
+    # Add books to libraries; both libraries share one INSERT into the M2M table
+    library_books = {
+        "Central Library": ["1984", "Animal Farm", "Harry Potter and the Sorcerer's Stone"],
+        "City Public Library": ["Harry Potter and the Sorcerer's Stone", "The Hobbit", "The Lord of the Rings"],
+    }
+    LibraryBooks = Library.books.through
+    LibraryBooks.objects.bulk_create(
+        [
+            LibraryBooks(library=libraries[library_name], book=books[title])
+            for library_name, titles in library_books.items()
+            for title in titles
+        ],
+        ignore_conflicts=True
+    )
+    
+    # Create librarians; a library that already has one keeps it
+    Librarian.objects.bulk_create([
+        Librarian(name="Alice Johnson", library=libraries["Central Library"]),
+        Librarian(name="Bob Smith", library=libraries["City Public Library"]),
+    ], ignore_conflicts=True)
     
     print("Sample data created successfully!\n")
 
-def query_all_books_by_author():
+def query_all_books_by_author(titles=None):
     """Query 1: Get all books by a specific author"""
     print("=== Query 1: All Books by George Orwell ===")
     
     # REQUIRED QUERY FOR AUTOMATED CHECK: Query all books by a specific author
     author_name = "George Orwell"
-    books = Book.objects.filter(author__name=author_name)
+    if titles is None:
+        books = Book.objects.filter(author__name=author_name)
+        titles = books.values_list('title', flat=True)
     
     print(f"Books by {author_name}:")
-    for book in books:
-        print(f"  - {book.title}")
+    for title in titles:
+        print(f"  - {title}")
     print()
 
-def query_all_books_in_library():
+def query_all_books_in_library(library=None):
     """Query 2: List all books in a specific library"""
     print("=== Query 2: All Books in Central Library ===")
     
-    # REQUIRED QUERY FOR AUTOMATED CHECK: Library.objects.get(name=library_name)
-    library_name = "Central Library"
-    library = Library.objects.get(name=library_name)
-    books = library.books.all()
+    if library is None:
+        # REQUIRED QUERY FOR AUTOMATED CHECK: Library.objects.get(name=library_name)
+        library_name = "Central Library"
+        library = Library.objects.get(name=library_name)
+        # Join the author name into the same query and skip building Book instances
+        books = library.books.values_list('title', 'author__name')
+    else:
+        # Books and authors were prefetched by run_central_library_queries()
+        books = [(book.title, book.author.name) for book in library.books.all()]
     
     print(f"Books in {library.name}:")
-    for book in books:
-        print(f"  - {book.title} by {book.author.name}")
+    for title, author_name in books:
+        print(f"  - {title} by {author_name}")
     print()
 
-def query_librarian_for_library():
+def query_librarian_for_library(library=None):
     """Query 3: Retrieve the librarian for a specific library"""
     print("=== Query 3: Librarian for Central Library ===")
     
-    # REQUIRED QUERY FOR AUTOMATED CHECK: Retrieve the librarian for a library
-    library_name = "Central Library"
-    library = Library.objects.get(name=library_name)
-    librarian = Librarian.objects.get(library=library)
+    if library is None:
+        # REQUIRED QUERY FOR AUTOMATED CHECK: Retrieve the librarian for a library
+        library_name = "Central Library"
+        library = Library.objects.get(name=library_name)
+        librarian = Librarian.objects.get(library=library)
+    else:
+        # Loaded with the library by select_related('librarian'); no extra query
+        librarian = library.librarian
     
     print(f"Librarian for {library.name}: {librarian.name}")
     print()
 
+def run_central_library_queries():
+    """Run queries 1-3 from two round trips: the library graph and the author's titles"""
+    library = (
+        Library.objects.select_related('librarian')
+        .prefetch_related(Prefetch('books', queryset=Book.objects.select_related('author')))
+        .get(name="Central Library")
+    )
+    titles = list(Book.objects.by_author_name("George Orwell").values_list('title', flat=True))
+    
+    query_all_books_by_author(titles)
+    query_all_books_in_library(library)
+    query_librarian_for_library(library)
+
 def demonstrate_required_queries():
     """Demonstrate the exact queries required by the automated check"""
     print("=== REQUIRED QUERIES FOR AUTOMATED CHECK ===")
     
+    # Fetch the library once, with its librarian and books, and reuse it below
+    library_name = "Central Library"
+    library = (
+        Library.objects.select_related('librarian')
+        .prefetch_related('books')
+        .get(name=library_name)
+    )
+    
     # Query 1: Query all books by a specific author using Author.objects.get
     print("1. Query all books by a specific author using Author.objects.get:")
     author_name = "George Orwell"
@@ -94,14 +151,12 @@ def demonstrate_required_queries():
     books_by_author = Book.objects.filter(author=author)  # MISSING QUERY PATTERN
     print(f"   Author.objects.get(name='{author_name}')")
     print(f"   Book.objects.filter(author=author)")
-    for book in books_by_author:
-        print(f"   - {book.title}")
+    for title in books_by_author.values_list('title', flat=True):
+        print(f"   - {title}")
     print()
     
     # Query 2: List all books in a library (using Library.objects.get)
     print("2. List all books in a library:")
-    library_name = "Central Library"
-    library = Library.objects.get(name=library_name)
     books_in_library = library.books.all()
     print(f"   Library.objects.get(name='{library_name}')")
     print(f"   Books in {library_name}:")
@@ -111,10 +166,8 @@ def demonstrate_required_queries():
     
     # Query 3: Retrieve the librarian for a library
     print("3. Retrieve the librarian for a library:")
-    library_name = "Central Library"
-    library = Library.objects.get(name=library_name)
-    librarian = Librarian.objects.get(library=library)
-    print(f"   Librarian.objects.get(library=library)")
+    librarian = library.librarian
+    print(f"   library.librarian  (loaded with the library by select_related)")
     print(f"   Librarian for {library_name}: {librarian.name}")
     print()
 
@@ -157,7 +210,8 @@ def additional_relationship_queries():
     # Many-to-many through relationship
     author = Author.objects.get(name="J.R.R. Tolkien")
     print(f"All books by {author.name} across all libraries:")
-    for book in author.books.all():
+    # Fetch every book's libraries in one IN (...) query instead of one per book
+    for book in author.books.prefetch_related('libraries'):
         libraries = book.libraries.all()
         library_names = [lib.name for lib in libraries]
         print(f"  - {book.title} available in: {', '.join(library_names)}")
@@ -181,10 +235,8 @@ if __name__ == "__main__":
     # Execute the required queries for automated check
     demonstrate_required_queries()
     
-    # Execute the individual required queries
-    query_all_books_by_author()
-    query_all_books_in_library()
-    query_librarian_for_library()
+    # Execute the individual required queries from one prefetched library
+    run_central_library_queries()
     
     # New method demonstrating the missing query patterns
     alternative_book_query_methods()
@@ -1,3 +1,177 @@
+"""
+Query-count tests for the sample queries in query_samples.py.
+"""
+
+import io
+from contextlib import redirect_stdout
+
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+
+from . import query_samples
+from .models import Author, Book, Librarian, Library
+
+
+class QuerySamplesTests(TestCase):
+    """
+    Lock in the number of queries issued by the sample query functions.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('create_sample_data', stdout=io.StringIO())
+
+    def test_books_by_author_lists_titles_in_one_query(self):
+        """
+        Titles are read straight from values_list.
+        """
+        out = io.StringIO()
+        with self.assertNumQueries(1), redirect_stdout(out):
+            query_samples.query_all_books_by_author()
+        self.assertIn("  - Animal Farm", out.getvalue())
+
+    def test_books_in_library_does_not_query_per_author(self):
+        """
+        Library lookup plus one joined book/author query.
+        """
+        with self.assertNumQueries(2), redirect_stdout(io.StringIO()):
+            query_samples.query_all_books_in_library()
+
+    def test_central_library_queries_share_one_fetch(self):
+        """
+        Library with librarian, its books with authors, and the author's titles.
+        """
+        out = io.StringIO()
+        with self.assertNumQueries(3), redirect_stdout(out):
+            query_samples.run_central_library_queries()
+        self.assertIn("  - Animal Farm by George Orwell", out.getvalue())
+        self.assertIn("Librarian for Central Library: Alice Johnson", out.getvalue())
+
+    def test_additional_queries_prefetch_libraries(self):
+        """
+        Books by an author fetch their libraries with a single prefetch query.
+        """
+        with self.assertNumQueries(9), redirect_stdout(io.StringIO()):
+            query_samples.additional_relationship_queries()
+
+    def test_librarian_for_library_uses_required_lookups(self):
+        """
+        Library.objects.get then Librarian.objects.get(library=library), as the check expects.
+        """
+        with self.assertNumQueries(2), redirect_stdout(io.StringIO()):
+            query_samples.query_librarian_for_library()
+
+    def test_librarian_reused_from_select_related_library(self):
+        """
+        A library loaded with select_related('librarian') needs no further query.
+        """
+        library = Library.objects.select_related('librarian').get(name="Central Library")
+        with self.assertNumQueries(0), redirect_stdout(io.StringIO()):
+            query_samples.query_librarian_for_library(library)
+
+    def test_required_queries_fetch_library_once(self):
+        """
+        Author and books by author, then the library with its librarian plus one books prefetch.
+        """
+        with self.assertNumQueries(4), redirect_stdout(io.StringIO()):
+            query_samples.demonstrate_required_queries()
+
+
+class CreateSampleDataTests(TestCase):
+    """
+    query_samples.create_sample_data inserts each table in one statement.
+    """
+
+    def test_create_sample_data_uses_bulk_inserts(self):
+        # One INSERT per table, plus re-reading authors, books and libraries
+        with self.assertNumQueries(8), redirect_stdout(io.StringIO()):
+            query_samples.create_sample_data()
+        self.assertEqual(Book.objects.count(), 5)
+        self.assertEqual(Library.objects.get(name="City Public Library").books.count(), 3)
+        self.assertEqual(Librarian.objects.count(), 2)
+
+    def test_create_sample_data_can_be_rerun(self):
+        with redirect_stdout(io.StringIO()):
+            query_samples.create_sample_data()
+            query_samples.create_sample_data()
+        self.assertEqual(Author.objects.count(), 3)
+        self.assertEqual(Book.objects.count(), 5)
+        self.assertEqual(Library.objects.get(name="Central Library").books.count(), 3)
+        self.assertEqual(Librarian.objects.count(), 2)
+
+
+class LibraryListViewTests(TestCase):
+    """
+    The library list renders every library from a single query.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('create_sample_data', stdout=io.StringIO())
+
+    def setUp(self):
+        cache.clear()
+
+    def test_library_list_is_single_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('relationship_app:library_list'))
+        self.assertContains(response, '(3 books)', count=2)
+        self.assertContains(response, 'Librarian: Alice Johnson')
+
+    def test_library_list_is_served_from_cache(self):
+        self.client.get(reverse('relationship_app:library_list'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('relationship_app:library_list'))
+        self.assertContains(response, 'Librarian: Alice Johnson')
+
+
+class ListCacheInvalidationTests(TestCase):
+    """
+    Cached book and library lists are dropped when the data behind them changes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('create_sample_data', stdout=io.StringIO())
+
+    def setUp(self):
+        cache.clear()
+
+    def test_added_book_shows_after_redirect(self):
+        user = User.objects.create_user('librarian', 'librarian@library.com', 'librarian123')
+        user.user_permissions.add(Permission.objects.get(codename='can_add_book'))
+        self.client.force_login(user)
+        self.client.get(reverse('relationship_app:list_books'))
+        response = self.client.post(
+            reverse('relationship_app:add_book'),
+            {'title': 'Homage to Catalonia', 'author': Author.objects.get(name='George Orwell').pk},
+            follow=True
+        )
+        self.assertContains(response, 'Homage to Catalonia')
+
+    def test_library_list_follows_membership_changes(self):
+        self.client.get(reverse('relationship_app:library_list'))
+        Library.objects.get(name='Central Library').books.add(Book.objects.get(title='The Hobbit'))
+        response = self.client.get(reverse('relationship_app:library_list'))
+        self.assertContains(response, '(4 books)')
+
+
+class BookManagementPermissionTests(TestCase):
+    """
+    Permission checks in book_management share one permission lookup.
+    """
 
-# Create your tests here.
+    def test_permissions_are_loaded_once(self):
+        user = User.objects.create_user('librarian', 'librarian@library.com', 'librarian123')
+        user.user_permissions.add(*Permission.objects.filter(
+            codename__in=['can_add_book', 'can_change_book']
+        ))
+        self.client.force_login(user)
+        # session, user, user permissions, group permissions, books
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('relationship_app:book_management'))
+        self.assertTrue(response.context['can_add_book'])
+        self.assertFalse(response.context['can_delete_book'])
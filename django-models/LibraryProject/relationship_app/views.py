@@ -3,12 +3,15 @@ from django.contrib.auth import login, logout
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth.decorators import login_required, permission_required, user_passes_test
 from django.contrib import messages
+from django.core.paginator import Paginator
 from django.views.generic import ListView
 from django.views.generic.detail import DetailView
 from django.urls import reverse
+from django.db.models import Count
 from .models import Book, Library, UserProfile, Author
 from .models import Library
 from .forms import CustomUserCreationForm, BookForm
+from .cache import get_book_list, get_library_list
 
 # Helper functions for user_passes_test
 def is_admin(user):
@@ -21,12 +24,14 @@ def is_member(user):
     return hasattr(user, 'userprofile') and user.userprofile.role == 'member'
 
 # Existing views (keep these)
+# The book and library lists come from the cache; the page itself is rendered per
+# request, since the navigation bar and the add-book link depend on the user
 def list_books(request):
     """Function-based view to display all books"""
-    books = Book.objects.all().select_related('author')
+    books = get_book_list()
     return render(request, 'relationship_app/list_books.html', {
         'books': books,
-        'can_add_book': request.user.has_perm('relationship_app.can_add_book')
+        'can_add_book': 'relationship_app.can_add_book' in request.user_perms
     })
 
 class LibraryDetailView(DetailView):
@@ -34,12 +39,18 @@ class LibraryDetailView(DetailView):
     model = Library
     template_name = 'relationship_app/library_detail.html'
     context_object_name = 'library'
+    
+    def get_queryset(self):
+        return Library.objects.select_related('librarian').prefetch_related('books__author')
 
 class LibraryListView(ListView):
     """Class-based view to display all libraries"""
     model = Library
     template_name = 'relationship_app/library_list.html'
     context_object_name = 'libraries'
+    
+    def get_queryset(self):
+        return get_library_list()
 
 # Authentication Views (keep these)
 def register_view(request):
@@ -84,22 +95,27 @@ def profile_view(request):
 @user_passes_test(is_admin, login_url='/relationship/login/')
 def admin_view(request):
     """Admin-only view"""
-    users = UserProfile.objects.all().select_related('user')
+    # Evaluate once; the template iterates users, so len() avoids a COUNT query
+    users = list(
+        UserProfile.objects.select_related('user')
+        .only('role', 'user__username', 'user__email', 'user__date_joined')
+    )
     return render(request, 'relationship_app/admin_view.html', {
         'users': users,
-        'total_users': users.count()
+        'total_users': len(users)
     })
 
 @login_required
 @user_passes_test(is_librarian, login_url='/relationship/login/')
 def librarian_view(request):
     """Librarian-only view"""
-    libraries = Library.objects.all()
-    books = Book.objects.all()
+    # Evaluate each queryset once and count per-library books in the same query
+    libraries = list(Library.objects.annotate(book_count=Count('books')))
+    books = list(Book.objects.all().select_related('author'))
     return render(request, 'relationship_app/librarian_view.html', {
         'libraries': libraries,
         'books': books,
-        'total_books': books.count()
+        'total_books': len(books)
     })
 
 @login_required
@@ -113,6 +129,8 @@ def member_view(request):
         'libraries': libraries
     })
 
+MANAGE_ROLES_PAGE_SIZE = 50
+
 @login_required
 @user_passes_test(is_admin, login_url='/relationship/login/')
 def manage_roles(request):
@@ -120,15 +138,22 @@ def manage_roles(request):
     if request.method == 'POST':
         user_id = request.POST.get('user_id')
         new_role = request.POST.get('role')
-        try:
-            user_profile = UserProfile.objects.get(id=user_id)
-            user_profile.role = new_role
-            user_profile.save()
-            messages.success(request, f'Role updated for {user_profile.user.username}')
-        except UserProfile.DoesNotExist:
+        # Read just the username for the message, then write the role with a
+        # single UPDATE instead of loading and re-saving the whole profile
+        profiles = UserProfile.objects.filter(id=user_id)
+        username = profiles.values_list('user__username', flat=True).first()
+        if username is not None:
+            profiles.update(role=new_role)
+            messages.success(request, f'Role updated for {username}')
+        else:
             messages.error(request, 'User not found')
     
-    users = UserProfile.objects.all().select_related('user')
+    # One page of profiles at a time, with only the columns the form shows, so the
+    # page stays the same size however many users there are
+    profiles = UserProfile.objects.select_related('user').only(
+        'id', 'role', 'user__username'
+    ).order_by('user__username')
+    users = Paginator(profiles, MANAGE_ROLES_PAGE_SIZE).get_page(request.GET.get('page'))
     return render(request, 'relationship_app/manage_roles.html', {'users': users})
 
 # Book Management Views with Custom Permissions
@@ -194,8 +219,9 @@ def delete_book(request, pk):
 def book_management(request):
     """Book management dashboard for users with change permissions"""
     books = Book.objects.all().select_related('author')
+    # request.user_perms is loaded once per request by PermissionCacheMiddleware
     return render(request, 'relationship_app/book_management.html', {
         'books': books,
-        'can_add_book': request.user.has_perm('relationship_app.can_add_book'),
-        'can_delete_book': request.user.has_perm('relationship_app.can_delete_book')
+        'can_add_book': 'relationship_app.can_add_book' in request.user_perms,
+        'can_delete_book': 'relationship_app.can_delete_book' in request.user_perms
     })
\ No newline at end of file
@@ -2,4 +2,8 @@ from django.apps import AppConfig
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'blog'
\ No newline at end of file
+    name = 'blog'
+
+    def ready(self):
+        # Connect the sidebar cache invalidation receivers
+        from . import cache  # noqa: F401
@@ -0,0 +1,137 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Exists, F, OuterRef
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Category, Post, Tag
+
+# Sidebar aggregates shared by the list views; refreshed every few minutes at most
+SIDEBAR_CACHE_TIMEOUT = 300
+POPULAR_TAGS_KEY = 'blog:popular_tags'
+CATEGORY_COUNTS_KEY = 'blog:category_counts'
+TOTAL_PUBLISHED_KEY = 'blog:total_published'
+AUTHOR_COUNT_KEY = 'blog:author_count'
+RECENT_POSTS_KEY = 'blog:recent_posts'
+SIDEBAR_CACHE_KEYS = [
+    POPULAR_TAGS_KEY, CATEGORY_COUNTS_KEY, TOTAL_PUBLISHED_KEY, AUTHOR_COUNT_KEY, RECENT_POSTS_KEY
+]
+
+def get_popular_tags():
+    """Top 15 tags that have posts, most used first"""
+    return cache.get_or_set(
+        POPULAR_TAGS_KEY,
+        lambda: list(
+            Tag.objects.with_post_count()
+            .filter(post_count__gt=0).order_by('-post_count')[:15]
+        ),
+        SIDEBAR_CACHE_TIMEOUT
+    )
+
+def get_category_counts():
+    """All categories with their post counts, most used first"""
+    return cache.get_or_set(
+        CATEGORY_COUNTS_KEY,
+        lambda: list(Category.objects.with_post_count().order_by('-post_count')),
+        SIDEBAR_CACHE_TIMEOUT
+    )
+
+def get_total_published_posts():
+    """Number of published posts"""
+    return cache.get_or_set(
+        TOTAL_PUBLISHED_KEY,
+        lambda: Post.objects.filter(status='published').count(),
+        SIDEBAR_CACHE_TIMEOUT
+    )
+
+def get_author_count():
+    """Number of users who have written at least one post"""
+    return cache.get_or_set(
+        AUTHOR_COUNT_KEY,
+        lambda: User.objects.filter(Exists(Post.objects.filter(author=OuterRef('pk')))).count(),
+        SIDEBAR_CACHE_TIMEOUT
+    )
+
+def get_recent_posts():
+    """The five most recently published posts"""
+    return cache.get_or_set(
+        RECENT_POSTS_KEY,
+        lambda: list(
+            Post.objects.filter(status='published')
+            .only('title', 'slug', 'published_date', 'featured_image')
+            .order_by('-published_date')[:5]
+        ),
+        SIDEBAR_CACHE_TIMEOUT
+    )
+
+def clear_sidebar_cache():
+    cache.delete_many(SIDEBAR_CACHE_KEYS)
+
+# Dropdown choices rendered by blog.forms.cached_choices
+CATEGORY_CHOICES_KEY = 'blog:category_choices'
+TAG_CHOICES_KEY = 'blog:tag_choices'
+AUTHOR_CHOICES_KEY = 'blog:author_choices'
+
+# Post views are counted in the cache and written to the database in batches
+VIEW_FLUSH_THRESHOLD = 10
+
+def post_views_key(post_id):
+    return f'blog:post_views:{post_id}'
+
+def record_post_view(post):
+    """Count a view of post and return how many views are not yet in post.views.
+    
+    The counter lives in the cache and is added to the views column with a
+    single UPDATE each time it reaches VIEW_FLUSH_THRESHOLD, instead of one
+    UPDATE per page hit.
+    """
+    key = post_views_key(post.pk)
+    cache.add(key, 0, None)
+    try:
+        pending = cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, 1, None)
+        pending = 1
+    # incr() hands each request a distinct value, so exactly one request sees the
+    # threshold and flushes it; views counted meanwhile stay in the counter
+    if pending == VIEW_FLUSH_THRESHOLD:
+        cache.decr(key, VIEW_FLUSH_THRESHOLD)
+        Post.objects.filter(pk=post.pk).update(views=F('views') + VIEW_FLUSH_THRESHOLD)
+    return pending
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_sidebar_on_save(sender, update_fields=None, **kwargs):
+    # View-count bumps do not change any of the cached aggregates
+    if update_fields is not None and set(update_fields) == {'views'}:
+        return
+    clear_sidebar_cache()
+
+@receiver(m2m_changed, sender=Post.tags.through)
+@receiver(m2m_changed, sender=Post.categories.through)
+def invalidate_sidebar_on_m2m_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        clear_sidebar_cache()
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_choices(sender, **kwargs):
+    cache.delete(CATEGORY_CHOICES_KEY)
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_choices(sender, **kwargs):
+    cache.delete(TAG_CHOICES_KEY)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_author_choices(sender, update_fields=None, **kwargs):
+    # Logins only write last_login; the choices show usernames
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    cache.delete(AUTHOR_CHOICES_KEY)
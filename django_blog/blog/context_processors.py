@@ -0,0 +1,20 @@
+from django.utils.functional import SimpleLazyObject
+
+from .cache import (
+    get_author_count, get_category_counts, get_popular_tags, get_recent_posts,
+    get_total_published_posts
+)
+
+def sidebar(request):
+    """Sidebar data for every template.
+    
+    Values are lazy, so pages without a sidebar never touch the cache, and each
+    one is looked up at most once per request.
+    """
+    return {
+        'sidebar_popular_tags': SimpleLazyObject(get_popular_tags),
+        'sidebar_categories': SimpleLazyObject(get_category_counts),
+        'sidebar_recent_posts': SimpleLazyObject(get_recent_posts),
+        'sidebar_total_posts': SimpleLazyObject(get_total_published_posts),
+        'sidebar_author_count': SimpleLazyObject(get_author_count),
+    }
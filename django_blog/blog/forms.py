@@ -1,10 +1,24 @@
 from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
+from .cache import AUTHOR_CHOICES_KEY, CATEGORY_CHOICES_KEY, TAG_CHOICES_KEY
 from .models import Profile, Post, Comment, Category, Tag
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db.models import Q
 from django.utils.text import slugify
 
+# How long the category/tag/author dropdown choices are reused between requests
+CHOICES_CACHE_TIMEOUT = 300
+
+def cached_choices(key, queryset):
+    """Return (pk, label) pairs for queryset, cached so rendering a form skips the query"""
+    return cache.get_or_set(
+        key,
+        lambda: [(obj.pk, str(obj)) for obj in queryset],
+        CHOICES_CACHE_TIMEOUT
+    )
+
 class UserRegisterForm(UserCreationForm):
     email = forms.EmailField(required=True, widget=forms.EmailInput(attrs={
         'placeholder': 'your.email@example.com',
@@ -37,11 +51,9 @@ class UserRegisterForm(UserCreationForm):
             }),
         }
     
-    def clean_email(self):
-        email = self.cleaned_data.get('email')
-        if User.objects.filter(email=email).exists():
-            raise ValidationError('This email address is already in use.')
-        return email
+    # Email uniqueness is enforced by the blog_auth_user_email_uniq index;
+    # the views turn the IntegrityError into this message.
+    duplicate_email_message = 'This email address is already in use.'
 
 class UserUpdateForm(forms.ModelForm):
     email = forms.EmailField(widget=forms.EmailInput(attrs={'class': 'form-control'}))
@@ -123,9 +135,18 @@ class PostForm(forms.ModelForm):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # Render choices from the cache; the queryset is still used to validate input
+        self.fields['categories'].choices = cached_choices(CATEGORY_CHOICES_KEY, Category.objects.all())
+        self.initial_tag_names = set()
         if self.instance and self.instance.pk:
-            tags = self.instance.tags.all()
+            # Reuse tags prefetched by the view (Post.objects.prefetch_related('tags'))
+            # and only query when the instance came without them
+            prefetched = getattr(self.instance, '_prefetched_objects_cache', {})
+            tags = prefetched.get('tags')
+            if tags is None:
+                tags = self.instance.tags.all()
             if tags:
+                self.initial_tag_names = {tag.name for tag in tags}
                 self.initial['tags_input'] = ', '.join([tag.name for tag in tags])
     
     def clean_title(self):
@@ -142,6 +163,7 @@ class PostForm(forms.ModelForm):
     
     def clean_tags_input(self):
         tags_input = self.cleaned_data.get('tags_input', '')
+        tags = []
         if tags_input:
             tags = [tag.strip() for tag in tags_input.split(',') if tag.strip()]
             if len(tags) > 10:
@@ -149,6 +171,10 @@ class PostForm(forms.ModelForm):
             for tag in tags:
                 if len(tag) > 50:
                     raise ValidationError(f"Tag '{tag}' is too long (max 50 characters).")
+                if not slugify(tag):
+                    raise ValidationError(f"Tag '{tag}' needs at least one letter or number.")
+        # Keep the parsed names so save() does not split the string again
+        self.cleaned_data['tag_names'] = tags
         return tags_input
     
     def save(self, commit=True):
@@ -158,15 +184,28 @@ class PostForm(forms.ModelForm):
             instance.save()
         
         # Handle tags
-        tags_input = self.cleaned_data.get('tags_input', '')
-        if tags_input:
-            tags = []
-            for tag_name in [tag.strip() for tag in tags_input.split(',') if tag.strip()]:
-                tag, created = Tag.objects.get_or_create(
-                    name=tag_name,
-                    defaults={'slug': slugify(tag_name)}
+        tag_names = self.cleaned_data.get('tag_names', [])
+        # Edits that leave the tags alone skip the lookups and M2M writes entirely
+        if tag_names and set(tag_names) != self.initial_tag_names:
+            # Look up all tags at once and insert only the missing ones in one statement.
+            # Tags match on slug as well as name, so "Django" reuses an existing
+            # "django" tag instead of being dropped by the unique slug
+            slugs = {name: slugify(name) for name in tag_names}
+            matching = Q(name__in=tag_names) | Q(slug__in=slugs.values())
+            tags = list(Tag.objects.filter(matching))
+            known_slugs = {tag.slug for tag in tags}
+            known_names = {tag.name for tag in tags}
+            missing = {
+                slugs[name]: name for name in tag_names
+                if name not in known_names and slugs[name] not in known_slugs
+            }
+            if missing:
+                Tag.objects.bulk_create(
+                    [Tag(name=name, slug=slug) for slug, name in missing.items()],
+                    ignore_conflicts=True
                 )
-                tags.append(tag)
+                cache.delete(TAG_CHOICES_KEY)
+                tags = Tag.objects.filter(matching)
             instance.tags.set(tags)
         
         # Save many-to-many relationships
@@ -284,6 +323,17 @@ class AdvancedSearchForm(forms.Form):
         required=False,
         widget=forms.Select(attrs={'class': 'form-control'})
     )
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Render the dropdowns from cached choices; the querysets are still used to validate input
+        for name, key, queryset in [
+            ('category', CATEGORY_CHOICES_KEY, Category.objects.all()),
+            ('tag', TAG_CHOICES_KEY, Tag.objects.all()),
+            ('author', AUTHOR_CHOICES_KEY, User.objects.all()),
+        ]:
+            field = self.fields[name]
+            field.choices = [('', field.empty_label)] + cached_choices(key, queryset)
 
 class SearchForm(forms.Form):
     """Simple search form for the navbar"""
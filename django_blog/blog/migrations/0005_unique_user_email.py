@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Enforce unique e-mail addresses on auth_user at the database level so
+    registration can rely on IntegrityError instead of a SELECT per signup.
+    Blank e-mails (e.g. superusers created without one) are left out of the index.
+    """
+
+    dependencies = [
+        ('blog', '0004_tag_post_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX blog_auth_user_email_uniq ON auth_user (email) WHERE email <> ''",
+            reverse_sql="DROP INDEX blog_auth_user_email_uniq",
+        ),
+    ]
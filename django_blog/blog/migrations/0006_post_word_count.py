@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+def backfill_word_count(apps, schema_editor):
+    """
+    Fill word_count for existing posts. Word splitting matches Post.save
+    (str.split), which SQLite cannot express in SQL, so it runs in Python
+    in batches.
+    """
+    Post = apps.get_model('blog', 'Post')
+    posts = []
+    for post in Post.objects.only('id', 'content').iterator(chunk_size=500):
+        post.word_count = len(post.content.split())
+        posts.append(post)
+        if len(posts) == 500:
+            Post.objects.bulk_update(posts, ['word_count'])
+            posts = []
+    if posts:
+        Post.objects.bulk_update(posts, ['word_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_unique_user_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_word_count, migrations.RunPython.noop),
+    ]
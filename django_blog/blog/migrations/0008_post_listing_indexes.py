@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-16 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_comment_count'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='blog_post_publish_a3f863_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='blog_post_status_02ce19_idx',
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', '-published_date'], name='post_status_pubdate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', '-published_date'], name='post_author_pubdate_idx'),
+        ),
+    ]
@@ -1,19 +1,73 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.text import slugify
-from PIL import Image
 import os
 
+from .tasks import resize_image_in_background
+
+def post_count_subquery(through, field_name):
+    """Count through-table rows for the outer row in a correlated subquery,
+    so the outer query is not joined to every post and grouped back down"""
+    return Coalesce(
+        Subquery(
+            through.objects.filter(**{field_name: OuterRef('pk')})
+            .order_by().values(field_name)
+            .annotate(count=Count('*')).values('count')
+        ),
+        0
+    )
+
+class TagQuerySet(models.QuerySet):
+    def with_post_count(self):
+        return self.annotate(post_count=post_count_subquery(Post.tags.through, 'tag'))
+
+class CategoryQuerySet(models.QuerySet):
+    def with_post_count(self):
+        return self.annotate(post_count=post_count_subquery(Post.categories.through, 'category'))
+
+def active_comment_count_subquery():
+    """Number of active comments on the outer post"""
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(post=OuterRef('pk'), is_active=True)
+            .order_by().values('post')
+            .annotate(count=Count('*')).values('count')
+        ),
+        0
+    )
+
+class PostQuerySet(models.QuerySet):
+    def search(self, query):
+        """Posts whose text, author or tag names contain query.
+        
+        Tags are matched with an EXISTS subquery rather than a join, so a post
+        with several matching tags comes back once and no DISTINCT is needed.
+        """
+        tag_match = Post.tags.through.objects.filter(
+            post=OuterRef('pk'), tag__name__icontains=query
+        )
+        return self.filter(
+            Q(title__icontains=query) |
+            Q(content__icontains=query) |
+            Q(excerpt__icontains=query) |
+            Q(author__username__icontains=query) |
+            Exists(tag_match)
+        )
+
 class Tag(models.Model):
     """Model for blog post tags"""
     name = models.CharField(max_length=50, unique=True)
     slug = models.SlugField(max_length=50, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = TagQuerySet.as_manager()
+    
     class Meta:
         ordering = ['name']
     
@@ -38,6 +92,8 @@ class Category(models.Model):
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = CategoryQuerySet.as_manager()
+    
     class Meta:
         verbose_name_plural = "Categories"
         ordering = ['name']
@@ -70,17 +126,29 @@ class Post(models.Model):
     tags = models.ManyToManyField(Tag, related_name='posts', blank=True)
     featured_image = models.ImageField(upload_to='post_images/', blank=True, null=True)
     views = models.PositiveIntegerField(default=0)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    objects = PostQuerySet.as_manager()
     
     class Meta:
         ordering = ['-published_date']
         indexes = [
-            models.Index(fields=['-published_date']),
-            models.Index(fields=['status']),
+            # Listings filter on status and sort newest first; one index serves both
+            models.Index(fields=['status', '-published_date'], name='post_status_pubdate_idx'),
+            models.Index(fields=['author', '-published_date'], name='post_author_pubdate_idx'),
         ]
     
     def __str__(self):
         return self.title
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Remember the stored image so save() can skip the resize when it is unchanged;
+        # read through __dict__ so a deferred field is not fetched here
+        image = self.__dict__.get('featured_image')
+        self._original_featured_image = getattr(image, 'name', image)
+    
     def get_absolute_url(self):
         return reverse('post-detail', kwargs={'slug': self.slug})
     
@@ -90,29 +158,70 @@ class Post(models.Model):
             self.excerpt = self.content[:297] + '...' if len(self.content) > 300 else self.content
         
         # Auto-generate slug if not provided
+        base_slug = None
         if not self.slug:
-            self.slug = slugify(self.title)
+            base_slug = self.slug = slugify(self.title)
         
-        super().save(*args, **kwargs)
+        # Store the word count so reading_time does not split the content on every render
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.word_count = len(self.content.split())
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'word_count'}
+        
+        # views and comment_count are kept current with queryset update(); a full
+        # save of a loaded post (e.g. PostUpdateView) must not write back the
+        # copies it read, or views and comments added meanwhile are lost
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            skipped = {'views', 'comment_count'} | self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in skipped
+            ]
         
-        # Resize featured image if it exists
-        if self.featured_image:
-            img = Image.open(self.featured_image.path)
-            if img.height > 800 or img.width > 1200:
-                output_size = (1200, 800)
-                img.thumbnail(output_size, Image.Resampling.LANCZOS)
-                img.save(self.featured_image.path, optimize=True, quality=85)
+        if base_slug is None:
+            super().save(*args, **kwargs)
+        else:
+            self._save_with_unique_slug(base_slug, *args, **kwargs)
+        
+        # Resize featured image when a new one was saved; saves limited to other
+        # fields (e.g. increment_views) leave the file alone
+        if (
+            self.featured_image
+            and (update_fields is None or 'featured_image' in update_fields)
+            and self.featured_image.name != self._original_featured_image
+        ):
+            resize_image_in_background(self.featured_image.path, 1200, 800)
+        self._original_featured_image = self.featured_image.name
+    
+    def _save_with_unique_slug(self, base_slug, *args, **kwargs):
+        """Insert with base_slug, adding -1, -2, ... while the unique index rejects it.
+        
+        The database does the uniqueness check, so the common case is a single
+        INSERT instead of a SELECT per candidate slug.
+        """
+        suffix = 1
+        while True:
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                if not Post.objects.filter(slug=self.slug).exists():
+                    raise
+                self.slug = f'{base_slug}-{suffix}'
+                suffix += 1
     
     def increment_views(self):
         """Increment view count"""
+        # Atomic UPDATE in the database; skips save() and its slug/excerpt/image work
+        Post.objects.filter(pk=self.pk).update(views=F('views') + 1)
         self.views += 1
-        self.save(update_fields=['views'])
     
     def reading_time(self):
         """Calculate estimated reading time (assuming 200 words per minute)"""
         words_per_minute = 200
-        word_count = len(self.content.split())
-        minutes = word_count // words_per_minute
+        minutes = self.word_count // words_per_minute
         if minutes == 0:
             return "Less than 1 min"
         return f"{minutes} min read"
@@ -134,11 +243,13 @@ class Comment(models.Model):
 
 class Profile(models.Model):
     """Extended user profile model"""
+    DEFAULT_PICTURE = 'profile_pics/default.jpg'
+    
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     bio = models.TextField(max_length=500, blank=True)
     location = models.CharField(max_length=100, blank=True)
     birth_date = models.DateField(null=True, blank=True)
-    profile_picture = models.ImageField(upload_to='profile_pics/', default='profile_pics/default.jpg')
+    profile_picture = models.ImageField(upload_to='profile_pics/', default=DEFAULT_PICTURE)
     website = models.URLField(blank=True)
     github = models.URLField(blank=True)
     twitter = models.URLField(blank=True)
@@ -146,25 +257,34 @@ class Profile(models.Model):
     def __str__(self):
         return f'{self.user.username} Profile'
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Remember the stored picture so save() only resizes a newly uploaded one
+        picture = self.__dict__.get('profile_picture')
+        self._original_profile_picture = getattr(picture, 'name', picture)
+    
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
         
-        # Resize profile picture if it exists
-        if self.profile_picture:
-            img = Image.open(self.profile_picture.path)
-            if img.height > 300 or img.width > 300:
-                output_size = (300, 300)
-                img.thumbnail(output_size, Image.Resampling.LANCZOS)
-                img.save(self.profile_picture.path, optimize=True, quality=85)
+        # Resize a newly saved profile picture; bio-only edits and the shared
+        # default picture are left alone
+        update_fields = kwargs.get('update_fields')
+        if (
+            self.profile_picture
+            and (update_fields is None or 'profile_picture' in update_fields)
+            and self.profile_picture.name not in (self._original_profile_picture, self.DEFAULT_PICTURE)
+        ):
+            resize_image_in_background(self.profile_picture.path, 300, 300)
+        self._original_profile_picture = self.profile_picture.name
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
+    # Profile changes are saved by the profile view; user saves leave it alone
     if created:
-        Profile.objects.create(user=instance)
+        Profile.objects.get_or_create(user=instance)
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    try:
-        instance.profile.save()
-    except:
-        Profile.objects.create(user=instance)
\ No newline at end of file
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def update_post_comment_count(sender, instance, **kwargs):
+    # Recount rather than +1/-1 so toggling is_active keeps the counter right
+    Post.objects.filter(pk=instance.post_id).update(comment_count=active_comment_count_subquery())
@@ -0,0 +1,17 @@
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+
+class FastPaginator(Paginator):
+    """Paginator that counts primary keys only.
+
+    Counting a DISTINCT queryset makes the database de-duplicate every
+    selected column; counting distinct ids gives the same total for less.
+    """
+
+    @cached_property
+    def count(self):
+        ids = self.object_list.order_by().values('pk')
+        if self.object_list.query.distinct:
+            ids = ids.distinct()
+        return ids.count()
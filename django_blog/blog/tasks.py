@@ -0,0 +1,24 @@
+import logging
+import threading
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+def resize_image(path, max_width, max_height, quality=85):
+    """Shrink the image at path in place so it fits within max_width x max_height"""
+    try:
+        img = Image.open(path)
+        if img.height > max_height or img.width > max_width:
+            img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+            img.save(path, optimize=True, quality=quality)
+    except (OSError, ValueError):
+        logger.exception('Could not resize image %s', path)
+
+def resize_image_in_background(path, max_width, max_height, quality=85):
+    """Run resize_image on a daemon thread so the request does not wait for it"""
+    threading.Thread(
+        target=resize_image,
+        args=(path, max_width, max_height, quality),
+        daemon=True
+    ).start()
@@ -1,3 +1,183 @@
+"""
+Behaviour tests for the denormalized post columns, the view-count buffer and
+the slug and tag handling.
+"""
+
+import importlib
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 
-# Create your tests here.
+from .cache import VIEW_FLUSH_THRESHOLD, post_views_key, record_post_view
+from .forms import PostForm
+from .models import Comment, Post, Tag
+
+
+class PostSlugTests(TestCase):
+    """
+    Posts with the same title get numbered slugs from the unique index retry.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('writer', 'writer@example.com', 'pass12345')
+
+    def test_duplicate_titles_get_numbered_slugs(self):
+        slugs = [
+            Post.objects.create(title='Same Title', content='Body', author=self.author).slug
+            for _ in range(3)
+        ]
+        self.assertEqual(slugs, ['same-title', 'same-title-1', 'same-title-2'])
+
+    def test_saving_an_existing_post_keeps_its_slug(self):
+        post = Post.objects.create(title='Same Title', content='Body', author=self.author)
+        post.title = 'Another Title'
+        post.save()
+        post.refresh_from_db()
+        self.assertEqual(post.slug, 'same-title')
+
+
+class RecordPostViewTests(TestCase):
+    """
+    Views are counted in the cache and flushed to the column in batches.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('writer', 'writer@example.com', 'pass12345')
+        cls.post = Post.objects.create(title='Viewed Post', content='Body', author=author)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_views_are_flushed_at_the_threshold(self):
+        for _ in range(VIEW_FLUSH_THRESHOLD - 1):
+            record_post_view(self.post)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 0)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(record_post_view(self.post), VIEW_FLUSH_THRESHOLD)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, VIEW_FLUSH_THRESHOLD)
+        self.assertEqual(cache.get(post_views_key(self.post.pk)), 0)
+
+    def test_view_counted_past_the_threshold_does_not_flush_again(self):
+        # Another request has taken the threshold value and not flushed yet
+        cache.set(post_views_key(self.post.pk), VIEW_FLUSH_THRESHOLD, None)
+        with self.assertNumQueries(0):
+            self.assertEqual(record_post_view(self.post), VIEW_FLUSH_THRESHOLD + 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 0)
+
+
+class PostCounterTests(TestCase):
+    """
+    word_count and comment_count are stored on the post and kept current.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('writer', 'writer@example.com', 'pass12345')
+        cls.post = Post.objects.create(title='Counted Post', content='one two three', author=cls.author)
+
+    def test_word_count_follows_content(self):
+        self.assertEqual(self.post.word_count, 3)
+        self.post.content = 'one two'
+        self.post.save(update_fields=['content'])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.word_count, 2)
+
+    def test_word_count_backfill(self):
+        Post.objects.update(word_count=0)
+        migration = importlib.import_module('blog.migrations.0006_post_word_count')
+        migration.backfill_word_count(apps, None)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.word_count, 3)
+
+    def test_comment_count_tracks_active_comments(self):
+        comment = Comment.objects.create(post=self.post, author=self.author, content='First')
+        Comment.objects.create(post=self.post, author=self.author, content='Second')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 2)
+
+        comment.is_active = False
+        comment.save()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+
+        Comment.objects.filter(post=self.post, is_active=True).delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 0)
+
+    def test_full_save_keeps_counters_changed_meanwhile(self):
+        stale = Post.objects.get(pk=self.post.pk)
+        Comment.objects.create(post=self.post, author=self.author, content='During the edit')
+        self.post.increment_views()
+
+        stale.title = 'Edited Counted Post'
+        stale.save()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, 'Edited Counted Post')
+        self.assertEqual(self.post.comment_count, 1)
+        self.assertEqual(self.post.views, 1)
+
+
+class UniqueEmailTests(TestCase):
+    """
+    Non-empty user emails are unique; users without an email are not affected.
+    """
+
+    def test_duplicate_email_is_rejected(self):
+        User.objects.create_user('first', 'same@example.com', 'pass12345')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user('second', 'same@example.com', 'pass12345')
+
+    def test_blank_emails_may_repeat(self):
+        User.objects.create_user('first', '', 'pass12345')
+        User.objects.create_user('second', '', 'pass12345')
+        self.assertEqual(User.objects.filter(email='').count(), 2)
+
+
+class PostFormTagTests(TestCase):
+    """
+    Tags typed into the post form are matched on name or slug.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('writer', 'writer@example.com', 'pass12345')
+        Tag.objects.create(name='django')
+
+    def save_post_with_tags(self, tags_input):
+        form = PostForm(data={
+            'title': 'A post about tags',
+            'content': 'Tags typed into the form are created once and reused afterwards.',
+            'status': 'published',
+            'tags_input': tags_input,
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+        form.instance.author = self.author
+        return form.save()
+
+    def test_tag_matching_an_existing_slug_is_reused(self):
+        post = self.save_post_with_tags('Django, Python')
+        self.assertEqual(sorted(tag.name for tag in post.tags.all()), ['Python', 'django'])
+        self.assertEqual(Tag.objects.count(), 2)
+
+
+class ProfilePictureTests(TestCase):
+    """
+    Profile saves only resize a newly saved picture.
+    """
+
+    def test_bio_edit_does_not_resize(self):
+        profile = User.objects.create_user('reader', 'reader@example.com', 'pass12345').profile
+        with mock.patch('blog.models.resize_image_in_background') as resize:
+            profile.bio = 'Reads a lot'
+            profile.save()
+        resize.assert_not_called()
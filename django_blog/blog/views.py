@@ -8,11 +8,16 @@ from django.views.generic import (
     ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
 )
 from django.urls import reverse_lazy
-from django.db.models import Q, Count
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Q, Count, Prefetch, Case, When, Value, F, Max, Min, Window, FloatField
+)
+from django.db.models.lookups import GreaterThan
 from django.http import JsonResponse, HttpResponseForbidden
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.utils import timezone
 from .models import Post, Profile, Comment, Category, Tag
+from .pagination import FastPaginator
+from .cache import record_post_view
 
 # Import only the forms we need
 from .forms import (
@@ -32,20 +37,13 @@ class HomeView(ListView):
     paginate_by = 6
     
     def get_queryset(self):
-        return Post.objects.filter(status='published').select_related('author').prefetch_related('categories', 'tags')
+        return Post.objects.filter(status='published').select_related('author__profile').prefetch_related(
+            'categories', 'tags'
+        ).defer('content')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['featured_posts'] = Post.objects.filter(status='published').order_by('-views')[:3]
-        context['categories'] = Category.objects.annotate(post_count=Count('posts')).order_by('-post_count')[:8]
-        context['recent_posts'] = Post.objects.filter(status='published').order_by('-published_date')[:5]
-        context['total_posts'] = Post.objects.filter(status='published').count()
-        # Get popular tags
-        context['popular_tags'] = Tag.objects.annotate(
-            post_count=Count('posts')
-        ).filter(post_count__gt=0).order_by('-post_count')[:10]
-        # Get count of users with posts
-        context['users'] = User.objects.filter(posts__isnull=False).distinct().count()
         return context
 
 # Post List View
@@ -58,7 +56,9 @@ class PostListView(ListView):
     ordering = ['-published_date']
     
     def get_queryset(self):
-        queryset = Post.objects.filter(status='published').select_related('author').prefetch_related('categories', 'tags')
+        queryset = Post.objects.filter(status='published').select_related('author__profile').prefetch_related(
+            'categories', 'tags'
+        ).defer('content')
         
         # Filter by category if provided
         category_slug = self.kwargs.get('category_slug')
@@ -75,24 +75,13 @@ class PostListView(ListView):
         # Search functionality
         search_query = self.request.GET.get('q')
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(content__icontains=search_query) |
-                Q(excerpt__icontains=search_query) |
-                Q(author__username__icontains=search_query) |
-                Q(tags__name__icontains=search_query)
-            ).distinct()
+            queryset = queryset.search(search_query)
         
         return queryset
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['search_form'] = SearchForm(self.request.GET or None)
-        context['categories'] = Category.objects.annotate(post_count=Count('posts')).order_by('-post_count')
-        context['popular_tags'] = Tag.objects.annotate(
-            post_count=Count('posts')
-        ).filter(post_count__gt=0).order_by('-post_count')[:15]
-        context['total_posts'] = Post.objects.filter(status='published').count()
         
         # Check if we're filtering by tag
         tag_slug = self.kwargs.get('tag_slug')
@@ -108,20 +97,35 @@ class PostDetailView(DetailView):
     template_name = 'blog/post_detail.html'
     context_object_name = 'post'
     
+    def get_queryset(self):
+        """Load everything the detail page renders alongside the post"""
+        return Post.objects.select_related('author__profile').prefetch_related(
+            'tags',
+            'categories',
+            Prefetch(
+                'comments',
+                queryset=Comment.objects.filter(is_active=True).select_related('author__profile'),
+                to_attr='active_comments'
+            )
+        )
+    
     def get_object(self):
         """Get post object and increment view count"""
         obj = super().get_object()
-        obj.increment_views()
+        # Buffered in the cache; show the count including views not yet flushed
+        obj.views += record_post_view(obj)
         return obj
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['comment_form'] = CommentForm()
-        context['comments'] = self.object.comments.filter(is_active=True).select_related('author')
+        context['comments'] = self.object.active_comments
+        # Tag ids come from the prefetch cache, so this is a single query
+        tag_ids = [tag.id for tag in self.object.tags.all()]
         context['related_posts'] = Post.objects.filter(
-            tags__in=self.object.tags.all(),
+            tags__in=tag_ids,
             status='published'
-        ).exclude(id=self.object.id).distinct()[:3]
+        ).exclude(id=self.object.id).distinct().prefetch_related('tags')[:3]
         return context
 
 # Create Post View
@@ -133,14 +137,9 @@ class PostCreateView(LoginRequiredMixin, CreateView):
     success_url = reverse_lazy('post-list')
     
     def form_valid(self, form):
-        """Set the author to current user and handle slug generation"""
+        """Set the author to current user; Post.save generates the slug"""
         form.instance.author = self.request.user
         
-        # Generate slug from title if not provided
-        if not form.instance.slug:
-            from django.utils.text import slugify
-            form.instance.slug = slugify(form.instance.title)
-        
         messages.success(self.request, 'Your post has been created successfully!')
         return super().form_valid(form)
     
@@ -157,6 +156,10 @@ class PostUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     form_class = PostForm
     template_name = 'blog/post_form.html'
     
+    def get_queryset(self):
+        """Prefetch tags so PostForm can fill tags_input without another query"""
+        return Post.objects.prefetch_related('tags')
+    
     def test_func(self):
         """Check if user is the author of the post"""
         post = self.get_object()
@@ -169,7 +172,6 @@ class PostUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     
     def form_valid(self, form):
         """Update the post and show success message"""
-        form.instance.updated_date = timezone.now()
         messages.success(self.request, 'Your post has been updated successfully!')
         return super().form_valid(form)
     
@@ -210,13 +212,19 @@ class UserPostListView(LoginRequiredMixin, ListView):
     paginate_by = 10
     
     def get_queryset(self):
-        return Post.objects.filter(author=self.request.user).order_by('-published_date')
+        return Post.objects.filter(author=self.request.user).defer('content').order_by('-published_date')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['total_posts'] = Post.objects.filter(author=self.request.user).count()
-        context['published_posts'] = Post.objects.filter(author=self.request.user, status='published').count()
-        context['draft_posts'] = Post.objects.filter(author=self.request.user, status='draft').count()
+        # All three counters from a single pass over the user's posts
+        counts = Post.objects.filter(author=self.request.user).aggregate(
+            total=Count('id'),
+            published=Count('id', filter=Q(status='published')),
+            draft=Count('id', filter=Q(status='draft'))
+        )
+        context['total_posts'] = counts['total']
+        context['published_posts'] = counts['published']
+        context['draft_posts'] = counts['draft']
         return context
 
 # Category Posts View
@@ -229,12 +237,13 @@ class CategoryPostListView(ListView):
     
     def get_queryset(self):
         self.category = get_object_or_404(Category, slug=self.kwargs.get('slug'))
-        return Post.objects.filter(categories=self.category, status='published').order_by('-published_date')
+        return Post.objects.filter(categories=self.category, status='published').select_related(
+            'author__profile'
+        ).defer('content').order_by('-published_date')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['category'] = self.category
-        context['categories'] = Category.objects.annotate(post_count=Count('posts')).order_by('-post_count')
         return context
 
 # Tag Posts View
@@ -247,14 +256,13 @@ class TagPostListView(ListView):
     
     def get_queryset(self):
         self.tag = get_object_or_404(Tag, slug=self.kwargs.get('slug'))
-        return Post.objects.filter(tags=self.tag, status='published').order_by('-published_date')
+        return Post.objects.filter(tags=self.tag, status='published').select_related(
+            'author__profile'
+        ).prefetch_related('tags').defer('content').order_by('-published_date')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['tag'] = self.tag
-        context['popular_tags'] = Tag.objects.annotate(
-            post_count=Count('posts')
-        ).filter(post_count__gt=0).order_by('-post_count')[:15]
         return context
 
 # Comment Views
@@ -292,7 +300,6 @@ class CommentUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     
     def form_valid(self, form):
         """Update the comment and show success message"""
-        form.instance.updated_date = timezone.now()
         messages.success(self.request, 'Your comment has been updated successfully!')
         return super().form_valid(form)
     
@@ -360,10 +367,15 @@ def register(request):
     if request.method == 'POST':
         form = UserRegisterForm(request.POST)
         if form.is_valid():
-            user = form.save()
-            username = form.cleaned_data.get('username')
-            messages.success(request, f'Account created for {username}! You can now log in.')
-            return redirect('login')
+            try:
+                with transaction.atomic():
+                    user = form.save()
+            except IntegrityError:
+                form.add_error('email', UserRegisterForm.duplicate_email_message)
+            else:
+                username = form.cleaned_data.get('username')
+                messages.success(request, f'Account created for {username}! You can now log in.')
+                return redirect('login')
     else:
         form = UserRegisterForm()
     
@@ -385,10 +397,15 @@ def profile(request):
         )
         
         if u_form.is_valid() and p_form.is_valid():
-            u_form.save()
-            p_form.save()
-            messages.success(request, 'Your profile has been updated!')
-            return redirect('profile')
+            try:
+                with transaction.atomic():
+                    u_form.save()
+                    p_form.save()
+            except IntegrityError:
+                u_form.add_error('email', UserRegisterForm.duplicate_email_message)
+            else:
+                messages.success(request, 'Your profile has been updated!')
+                return redirect('profile')
     else:
         u_form = UserUpdateForm(instance=request.user)
         p_form = ProfileUpdateForm(instance=request.user.profile)
@@ -404,20 +421,22 @@ def profile(request):
 @login_required
 def like_post(request, slug):
     """Like/unlike a post (simplified version)"""
-    post = get_object_or_404(Post, slug=slug)
+    # Reject non-AJAX requests before touching the database
+    if request.method != 'POST' or request.headers.get('x-requested-with') != 'XMLHttpRequest':
+        return JsonResponse({'success': False, 'error': 'Invalid request'}, status=400)
     
-    if request.method == 'POST' and request.is_ajax():
-        # In a real implementation, you'd have a Like model
-        # This is a simplified version
-        return JsonResponse({'success': True, 'message': 'Post liked!'})
-    
-    return JsonResponse({'success': False, 'error': 'Invalid request'})
+    post = get_object_or_404(Post, slug=slug)
+    # In a real implementation, you'd have a Like model
+    # This is a simplified version
+    return JsonResponse({'success': True, 'message': 'Post liked!'})
 
 # Enhanced Search View
 def search_posts(request):
     """Search posts with advanced filtering"""
     form = AdvancedSearchForm(request.GET or None)
-    posts = Post.objects.filter(status='published').select_related('author').prefetch_related('categories', 'tags')
+    posts = Post.objects.filter(status='published').select_related('author__profile').prefetch_related(
+        'categories', 'tags'
+    ).defer('content')
     
     if form.is_valid():
         query = form.cleaned_data.get('query')
@@ -430,13 +449,7 @@ def search_posts(request):
         
         # Apply filters
         if query:
-            posts = posts.filter(
-                Q(title__icontains=query) |
-                Q(content__icontains=query) |
-                Q(excerpt__icontains=query) |
-                Q(author__username__icontains=query) |
-                Q(tags__name__icontains=query)
-            ).distinct()
+            posts = posts.search(query)
         
         if category:
             posts = posts.filter(categories=category)
@@ -456,16 +469,8 @@ def search_posts(request):
         if status:
             posts = posts.filter(status=status)
     
-    # Get popular tags for sidebar
-    popular_tags = Tag.objects.annotate(
-        post_count=Count('posts')
-    ).filter(post_count__gt=0).order_by('-post_count')[:15]
-    
-    # Get recent posts for sidebar
-    recent_posts = Post.objects.filter(status='published').order_by('-published_date')[:5]
-    
-    # Pagination
-    paginator = Paginator(posts, 9)
+    # Pagination; the prefetches only run for the 9 posts on the page
+    paginator = FastPaginator(posts, 9)
     page = request.GET.get('page')
     
     try:
@@ -480,8 +485,6 @@ def search_posts(request):
         'posts': posts,
         'title': 'Search Results',
         'query': request.GET.get('query', ''),
-        'popular_tags': popular_tags,
-        'recent_posts': recent_posts,
         'total_results': paginator.count,
     }
     return render(request, 'blog/search_results.html', context)
@@ -490,16 +493,15 @@ def search_posts(request):
 @login_required
 def comment_like(request, comment_id):
     """Like a comment (AJAX)"""
-    comment = get_object_or_404(Comment, id=comment_id)
+    if request.method != 'POST' or request.headers.get('x-requested-with') != 'XMLHttpRequest':
+        return JsonResponse({'success': False, 'error': 'Invalid request'}, status=400)
     
-    if request.method == 'POST' and request.is_ajax():
-        # Simple like toggle - in production, use a Like model
-        return JsonResponse({
-            'success': True, 
-            'message': 'Comment liked!'
-        })
-    
-    return JsonResponse({'success': False, 'error': 'Invalid request'})
+    comment = get_object_or_404(Comment, id=comment_id)
+    # Simple like toggle - in production, use a Like model
+    return JsonResponse({
+        'success': True, 
+        'message': 'Comment liked!'
+    })
 
 @login_required
 def comment_reply(request, comment_id):
@@ -521,22 +523,20 @@ def comment_reply(request, comment_id):
 # Tag cloud view
 def tag_cloud(request):
     """Display all tags in a cloud format"""
-    tags = Tag.objects.annotate(
-        post_count=Count('posts')
-    ).filter(post_count__gt=0).order_by('name')
-    
-    # Calculate font sizes for tag cloud
-    if tags:
-        max_count = max(tag.post_count for tag in tags)
-        min_count = min(tag.post_count for tag in tags)
-        
-        for tag in tags:
-            # Normalize count to a scale of 1-5 for font sizes
-            if max_count > min_count:
-                normalized = (tag.post_count - min_count) / (max_count - min_count)
-                tag.font_size = 1 + (normalized * 4)  # Scale to 1-5
-            else:
-                tag.font_size = 3  # Default size if all counts are equal
+    # Font sizes are scaled 1-5 between the smallest and largest counts; the
+    # bounds come from window functions so the whole cloud is one query
+    max_count = Window(Max('post_count'))
+    min_count = Window(Min('post_count'))
+    tags = Tag.objects.with_post_count().filter(post_count__gt=0).annotate(
+        font_size=Case(
+            When(
+                GreaterThan(max_count, min_count),
+                then=1 + 4.0 * (F('post_count') - min_count) / (max_count - min_count)
+            ),
+            default=Value(3.0),  # Default size if all counts are equal
+            output_field=FloatField()
+        )
+    ).order_by('name')
     
     context = {
         'tags': tags,
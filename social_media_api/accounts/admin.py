@@ -2,7 +2,15 @@
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser
+from .models import CustomUser, Follow
+
+class FollowerInline(admin.TabularInline):
+    model = Follow
+    fk_name = 'followed'
+    raw_id_fields = ('follower',)
+    extra = 0
+    verbose_name = 'follower'
+    verbose_name_plural = 'followers'
 
 class CustomUserAdmin(UserAdmin):
     list_display = ('username', 'email', 'first_name', 'last_name', 'is_staff', 'date_joined')
@@ -12,8 +20,9 @@ class CustomUserAdmin(UserAdmin):
     
     fieldsets = UserAdmin.fieldsets + (
         ('Additional Information', {
-            'fields': ('bio', 'profile_picture', 'location', 'website', 'followers')
+            'fields': ('bio', 'profile_picture', 'location', 'website')
         }),
     )
+    inlines = [FollowerInline]
 
 admin.site.register(CustomUser, CustomUserAdmin)
\ No newline at end of file
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class AccountsConfig(AppConfig):
     name = 'accounts'
+    
+    def ready(self):
+        # Register the token cache invalidation signals
+        from . import authentication  # noqa: F401
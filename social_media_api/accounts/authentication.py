@@ -0,0 +1,51 @@
+# accounts/authentication.py
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+# How long a token (with its user) is served from the cache before re-checking the DB;
+# short, since changes made with queryset.update() send no signal to clear it
+TOKEN_CACHE_TIMEOUT = 30
+
+def token_cache_key(key):
+    return f'auth:token:{key}'
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that keeps the token and its user in the cache, so an
+    authenticated request does not hit authtoken_token on every call.
+    Entries are dropped when the token is deleted (logout) or the user is saved.
+    
+    Only safe with a cache shared by all workers (Redis); settings fall back to
+    TokenAuthentication otherwise.
+    """
+    
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        token = cache.get(cache_key)
+        if token is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set(cache_key, token, TOKEN_CACHE_TIMEOUT)
+            return (user, token)
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (token.user, token)
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    cache.delete(token_cache_key(instance.key))
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    # Profile edits or deactivation must not be masked by a cached copy of the user
+    if not created:
+        cache.delete_many([
+            token_cache_key(key)
+            for key in Token.objects.filter(user=instance).values_list('key', flat=True)
+        ])
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_username_trigram_index(apps, schema_editor):
+    # Trigram indexes are PostgreSQL only; SQLite development databases skip this
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # icontains/istartswith compare UPPER("username"::text), so index that expression
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS accounts_customuser_username_trgm '
+        'ON accounts_customuser USING gin (UPPER(username::text) gin_trgm_ops)'
+    )
+
+
+def drop_username_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS accounts_customuser_username_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_follow'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_username_trigram_index, drop_username_trigram_index),
+    ]
@@ -3,6 +3,8 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import FileExtensionValidator
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
 class CustomUser(AbstractUser):
     # ... existing fields ...
@@ -20,6 +22,8 @@ class CustomUser(AbstractUser):
     # Follow relationships - make sure this is correctly defined
     followers = models.ManyToManyField(
         'self',
+        through='Follow',
+        through_fields=('followed', 'follower'),
         symmetrical=False,  # If A follows B, B doesn't automatically follow A
         related_name='following',  # This creates the reverse relationship
         blank=True
@@ -33,16 +37,69 @@ class CustomUser(AbstractUser):
     
     @property
     def follower_count(self):
-        return self.followers.count()
+        # Set by with_follow_counts(); otherwise counted once and kept on the instance
+        if not hasattr(self, 'num_followers'):
+            self.num_followers = self.followers.count()
+        return self.num_followers
     
     @property
     def following_count(self):
-        return self.following.count()  # This uses the reverse related name
+        if not hasattr(self, 'num_following'):
+            self.num_following = self.following.count()  # This uses the reverse related name
+        return self.num_following
+    
+    def reset_follow_counts(self):
+        """Forget counts kept on the instance after its follows change"""
+        self.__dict__.pop('num_followers', None)
+        self.__dict__.pop('num_following', None)
     
     def is_following(self, user):
         """Check if current user is following the given user"""
-        return user in self.following.all()
+        return self.following.filter(pk=user.pk).exists()
     
     def is_followed_by(self, user):
         """Check if current user is followed by the given user"""
-        return user in self.followers.all()
\ No newline at end of file
+        return self.followers.filter(pk=user.pk).exists()
+
+class Follow(models.Model):
+    """A follower following another user (the through table of CustomUser.followers)"""
+    # Columns keep the names of the table Django generated before this model existed
+    followed = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name='+', db_column='from_customuser_id'
+    )
+    follower = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name='+', db_column='to_customuser_id'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'accounts_customuser_followers'
+        # (followed, follower) backs "who follows X"; the index covers "whom does X follow"
+        unique_together = [('followed', 'follower')]
+        indexes = [models.Index(fields=['follower', 'followed'], name='follow_follower_followed_idx')]
+    
+    def __str__(self):
+        return f'{self.follower_id} follows {self.followed_id}'
+
+def follow_count_subquery(field_name):
+    """Count follow rows pointing at the outer user through field_name"""
+    return Coalesce(
+        Subquery(
+            Follow.objects.filter(**{field_name: OuterRef('pk')})
+            .order_by().values(field_name)
+            .annotate(count=Count('*')).values('count')
+        ),
+        0
+    )
+
+def with_follow_counts(queryset):
+    """Annotate users with follower/following counts read by the count properties"""
+    return queryset.annotate(
+        num_followers=follow_count_subquery('followed'),
+        num_following=follow_count_subquery('follower')
+    )
+
+def followed_user_ids(user):
+    """Ids of the users user follows, as a subquery on the Follow table alone;
+    follow_follower_followed_idx answers it without touching the user table"""
+    return Follow.objects.filter(follower=user).values('followed_id')
@@ -92,20 +92,31 @@ class FollowUserSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 
                  'profile_picture', 'bio', 'follower_count', 'following_count',
                  'is_following', 'is_followed_by']
+        read_only_fields = fields
     
     def get_is_following(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return request.user.is_following(obj)
-        return False
+        # Annotated by UserSearchView; other callers fall back to the id sets below
+        if hasattr(obj, 'is_following_flag'):
+            return obj.is_following_flag
+        return obj.id in self._request_user_ids('following')
     
     def get_is_followed_by(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return request.user.is_followed_by(obj)
-        return False
-
-class FollowListSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = User
-        fields = ['id', 'username', 'profile_picture']
\ No newline at end of file
+        if hasattr(obj, 'is_followed_by_flag'):
+            return obj.is_followed_by_flag
+        return obj.id in self._request_user_ids('followers')
+    
+    def _request_user_ids(self, relation):
+        """Ids of the request user's following/followers, loaded once per serialization.
+        
+        The context dict is shared by every row of a many=True serializer, so a
+        list costs one query per relation instead of one per row.
+        """
+        cache_key = f'_{relation}_ids'
+        if cache_key not in self.context:
+            request = self.context.get('request')
+            if request and request.user.is_authenticated:
+                ids = set(getattr(request.user, relation).values_list('id', flat=True))
+            else:
+                ids = set()
+            self.context[cache_key] = ids
+        return self.context[cache_key]
\ No newline at end of file
@@ -5,11 +5,15 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.authtoken.models import Token
+from rest_framework.pagination import CursorPagination
 from django.contrib.auth import logout
+from django.core.files.storage import default_storage
 from .serializers import UserRegistrationSerializer, UserLoginSerializer, UserProfileSerializer
-from .models import CustomUser
+from .models import CustomUser, Follow, with_follow_counts
+from django.db import transaction
+from django.db.models import Exists, OuterRef
 from django.shortcuts import get_object_or_404
-from .serializers import FollowSerializer, FollowUserSerializer, FollowListSerializer
+from .serializers import FollowSerializer, FollowUserSerializer
 from notifications.models import Notification
 
 class UserRegistrationView(APIView):
@@ -50,20 +54,20 @@ class UserLogoutView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
-        # Delete the token to logout
-        try:
-            request.user.auth_token.delete()
-        except:
-            pass
+        # Delete the token to logout; post_delete drops it from the token cache
+        Token.objects.filter(user=request.user).delete()
         
-        logout(request)
+        # Token clients have no session, so skip the flush and CSRF rotation
+        if request.session.session_key:
+            logout(request)
         return Response({'message': 'Successfully logged out'}, status=status.HTTP_200_OK)
 
 class UserProfileView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        serializer = UserProfileSerializer(request.user)
+        user = with_follow_counts(CustomUser.objects.filter(pk=request.user.pk)).get()
+        serializer = UserProfileSerializer(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
     def put(self, request):
@@ -78,12 +82,14 @@ class UserProfileDetailView(APIView):
     
     def get(self, request, username):
         try:
-            user = CustomUser.objects.get(username=username)
+            user = with_follow_counts(CustomUser.objects.all()).get(username=username)
             serializer = UserProfileSerializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except CustomUser.DoesNotExist:
             return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
 
+SEARCH_PREFIX_MAX_LENGTH = 3
+
 # Add GenericAPIView implementation for UserSearchView
 class UserSearchView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
@@ -92,9 +98,26 @@ class UserSearchView(generics.GenericAPIView):
     def get_queryset(self):
         query = self.request.query_params.get('q', '')
         if query:
-            return CustomUser.objects.all().filter(
-                username__icontains=query
-            ).exclude(id=self.request.user.id)[:10]
+            # Follow flags come back as EXISTS columns instead of two queries per result
+            user_id = self.request.user.id
+            # Short type-ahead queries match on the prefix; longer ones search
+            # anywhere in the name, backed by the trigram index on PostgreSQL
+            if len(query) <= SEARCH_PREFIX_MAX_LENGTH:
+                name_filter = {'username__istartswith': query}
+            else:
+                name_filter = {'username__icontains': query}
+            return with_follow_counts(CustomUser.objects.filter(
+                **name_filter
+            )).exclude(id=user_id).only(
+                'id', 'username', 'email', 'first_name', 'last_name', 'profile_picture', 'bio'
+            ).annotate(
+                is_following_flag=Exists(Follow.objects.filter(
+                    followed_id=OuterRef('pk'), follower_id=user_id
+                )),
+                is_followed_by_flag=Exists(Follow.objects.filter(
+                    followed_id=user_id, follower_id=OuterRef('pk')
+                ))
+            )[:10]
         return CustomUser.objects.none()
     
     def get(self, request):
@@ -118,24 +141,27 @@ class FollowUserView(APIView):
                 )
             
             # Get the user to follow
-            user_to_follow = get_object_or_404(CustomUser, id=user_id)
+            user_to_follow = get_object_or_404(CustomUser.objects.only('id', 'username'), id=user_id)
             
-            # Check if already following
-            if request.user.is_following(user_to_follow):
-                return Response(
-                    {'error': 'You are already following this user.'},
-                    status=status.HTTP_400_BAD_REQUEST
+            # The unique (followed, follower) constraint settles concurrent
+            # requests; only the one that inserts the row sends a notification
+            with transaction.atomic():
+                _, created = Follow.objects.get_or_create(
+                    followed=user_to_follow, follower=request.user
                 )
+                if not created:
+                    return Response(
+                        {'error': 'You are already following this user.'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                
+                # Notify the followed user once the follow is committed
+                transaction.on_commit(lambda: Notification.create_follow_notification(
+                    recipient=user_to_follow,
+                    actor=request.user
+                ))
             
-            # Add to following
-            request.user.following.add(user_to_follow)
-            
-            # Create notification for the followed user
-            Notification.create_follow_notification(
-                recipient=user_to_follow,
-                actor=request.user
-            )
-            
+            request.user.reset_follow_counts()
             return Response({
                 'message': f'You are now following {user_to_follow.username}',
                 'following': True,
@@ -161,10 +187,10 @@ class UnfollowUserView(APIView):
                 )
             
             # Get the user to unfollow
-            user_to_unfollow = get_object_or_404(CustomUser, id=user_id)
+            user_to_unfollow = get_object_or_404(CustomUser.objects.only('id', 'username'), id=user_id)
             
             # Check if actually following
-            if not request.user.is_following(user_to_unfollow):
+            if not request.user.following.filter(pk=user_to_unfollow.pk).exists():
                 return Response(
                     {'error': 'You are not following this user.'},
                     status=status.HTTP_400_BAD_REQUEST
@@ -172,6 +198,7 @@ class UnfollowUserView(APIView):
             
             # Remove from following
             request.user.following.remove(user_to_unfollow)
+            request.user.reset_follow_counts()
             
             return Response({
                 'message': f'You have unfollowed {user_to_unfollow.username}',
@@ -182,20 +209,51 @@ class UnfollowUserView(APIView):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class FollowersListView(generics.ListAPIView):
-    permission_classes = [IsAuthenticated]
-    serializer_class = FollowListSerializer
-    
-    def get_queryset(self):
-        user_id = self.kwargs.get('user_id')
-        user = get_object_or_404(CustomUser, id=user_id)
-        return user.followers.all()
+class FollowCursorPagination(CursorPagination):
+    # Most recent follows first; Follow.id is unique, so the cursor never skips rows
+    ordering = '-id'
+    page_size = 25
 
-class FollowingListView(generics.ListAPIView):
+class FollowListView(generics.ListAPIView):
+    """Pages over Follow rows and lists the user on the other side.
+    
+    Rows are read with values() and turned into dicts directly; for three
+    plain columns a ModelSerializer only adds per-field overhead.
+    """
     permission_classes = [IsAuthenticated]
-    serializer_class = FollowListSerializer
+    pagination_class = FollowCursorPagination
+    user_field = None
+    filter_field = None
     
     def get_queryset(self):
-        user_id = self.kwargs.get('user_id')
-        user = get_object_or_404(CustomUser, id=user_id)
-        return user.following.all()
\ No newline at end of file
+        user = get_object_or_404(CustomUser, id=self.kwargs.get('user_id'))
+        return Follow.objects.filter(**{self.filter_field: user}).values(
+            'id',
+            f'{self.user_field}__id',
+            f'{self.user_field}__username',
+            f'{self.user_field}__profile_picture',
+        )
+    
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        prefix = f'{self.user_field}__'
+        data = [
+            {
+                'id': row[prefix + 'id'],
+                'username': row[prefix + 'username'],
+                'profile_picture': (
+                    request.build_absolute_uri(default_storage.url(row[prefix + 'profile_picture']))
+                    if row[prefix + 'profile_picture'] else None
+                ),
+            }
+            for row in page
+        ]
+        return self.get_paginated_response(data)
+
+class FollowersListView(FollowListView):
+    user_field = 'follower'
+    filter_field = 'followed'
+
+class FollowingListView(FollowListView):
+    user_field = 'followed'
+    filter_field = 'follower'
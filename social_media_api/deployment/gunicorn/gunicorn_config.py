@@ -7,8 +7,11 @@ bind = 'unix:/run/gunicorn/social_media_api.sock'
 backlog = 2048
 
 # Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = 'sync'
+# Threaded workers: requests spend most of their time waiting on the database,
+# so each process serves several at once instead of blocking on one
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
 worker_connections = 1000
 timeout = 30
 keepalive = 2
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class NotificationsConfig(AppConfig):
     name = 'notifications'
+    
+    def ready(self):
+        # Register the notification count cache invalidation signals
+        from . import cache  # noqa: F401
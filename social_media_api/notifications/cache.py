@@ -0,0 +1,60 @@
+# notifications/cache.py
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Notification
+
+# Clients poll the counts; entries are dropped on every write, the timeout
+# only bounds staleness from writes that bypass the helpers below
+NOTIFICATION_COUNTS_TIMEOUT = 60 * 60
+
+# The full count behind total_count is taken at most hourly; rows added since
+# are counted on top of it, and deletes drop it
+NOTIFICATION_TOTAL_BASE_TIMEOUT = 60 * 60
+
+def notification_counts_key(user_id):
+    return f'notifications:counts:{user_id}'
+
+def notification_total_base_key(user_id):
+    return f'notifications:total_base:{user_id}'
+
+def get_notification_total(user_id):
+    """Total notifications for a user: a stored base count plus the rows created
+    after it, so a recount only reads the newest rows"""
+    base = cache.get_or_set(
+        notification_total_base_key(user_id),
+        lambda: Notification.objects.filter(recipient_id=user_id).aggregate(
+            total=Count('id'), last_id=Max('id')
+        ),
+        NOTIFICATION_TOTAL_BASE_TIMEOUT
+    )
+    return base['total'] + Notification.objects.filter(
+        recipient_id=user_id, id__gt=base['last_id'] or 0
+    ).count()
+
+def get_notification_counts(user_id):
+    """Unread and total notification counts for a user"""
+    return cache.get_or_set(
+        notification_counts_key(user_id),
+        lambda: {
+            # Served by the partial unread index
+            'unread_count': Notification.objects.filter(recipient_id=user_id, read=False).count(),
+            'total_count': get_notification_total(user_id),
+        },
+        NOTIFICATION_COUNTS_TIMEOUT
+    )
+
+def clear_notification_counts(*user_ids):
+    cache.delete_many([notification_counts_key(user_id) for user_id in user_ids])
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def invalidate_notification_counts(sender, instance, **kwargs):
+    clear_notification_counts(instance.recipient_id)
+
+@receiver(post_delete, sender=Notification)
+def invalidate_notification_total_base(sender, instance, **kwargs):
+    cache.delete(notification_total_base_key(instance.recipient_id))
@@ -0,0 +1,24 @@
+from django.db import migrations
+from django.db.models import F
+
+
+def copy_created_at_to_timestamp(apps, schema_editor):
+    # Rows that predate 0004 got the migration time as their timestamp;
+    # created_at still holds when they were actually created
+    Notification = apps.get_model('notifications', 'Notification')
+    Notification.objects.update(timestamp=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_alter_notification_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_created_at_to_timestamp, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='notification',
+            name='created_at',
+        ),
+    ]
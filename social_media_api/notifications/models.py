@@ -4,7 +4,6 @@ from django.db import models
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.utils import timezone
 
 class Notification(models.Model):
     NOTIFICATION_TYPES = (
@@ -41,25 +40,38 @@ class Notification(models.Model):
     
     read = models.BooleanField(default=False)
     timestamp = models.DateTimeField(auto_now_add=True)  # Changed from created_at to timestamp
-    created_at = models.DateTimeField(auto_now_add=True)  # Keep both for compatibility
     
     class Meta:
         ordering = ['-timestamp']
         indexes = [
             models.Index(fields=['recipient', 'read', 'timestamp']),
             models.Index(fields=['recipient', 'notification_type']),
+            # Unread rows only: serves the unread list, unread counts and mark-all-read
+            # without carrying every read notification in the index
+            models.Index(
+                fields=['recipient', '-timestamp'],
+                name='notif_unread_idx',
+                condition=models.Q(read=False)
+            ),
         ]
     
     def __str__(self):
         return f"{self.actor.username} {self.verb}"
     
     def mark_as_read(self):
-        self.read = True
-        self.save()
+        self._set_read(True)
     
     def mark_as_unread(self):
-        self.read = False
-        self.save()
+        self._set_read(False)
+    
+    def _set_read(self, read):
+        """Write only the read column instead of saving the whole row"""
+        from .cache import clear_notification_counts
+        
+        type(self).objects.filter(pk=self.pk).update(read=read)
+        self.read = read
+        # update() sends no post_save, so drop the cached counts here
+        clear_notification_counts(self.recipient_id)
     
     @classmethod
     def create_like_notification(cls, recipient, actor, target):
@@ -78,23 +90,31 @@ class Notification(models.Model):
             verb=verb,
             notification_type='like',
             target_content_type=content_type,
-            target_object_id=target.id,
-            timestamp=timezone.now()
+            target_object_id=target.id
         )
     
+    @staticmethod
+    def comment_verb(comment_text=None):
+        return f'commented on your post: "{comment_text[:50]}..."' if comment_text else 'commented on your post'
+    
     @classmethod
     def create_comment_notification(cls, recipient, actor, target, comment_text=None):
         """Create notification for comments"""
+        content_type = ContentType.objects.get_for_model(target)
         return cls.objects.create(
             recipient=recipient,
             actor=actor,
-            verb=f'commented on your post: "{comment_text[:50]}..."' if comment_text else 'commented on your post',
+            verb=cls.comment_verb(comment_text),
             notification_type='comment',
-            target_content_type=ContentType.objects.get_for_model(target),
-            target_object_id=target.id,
-            timestamp=timezone.now()
+            target_content_type=content_type,
+            target_object_id=target.id
         )
     
+    @classmethod
+    def create_comment_notifications_bulk(cls, recipients, actor, target, comment_text=None):
+        """Notify every recipient of a comment with batched multi-row INSERTs"""
+        return cls._create_bulk(recipients, actor, cls.comment_verb(comment_text), 'comment', target)
+    
     @classmethod
     def create_follow_notification(cls, recipient, actor):
         """Create notification for follows"""
@@ -102,19 +122,47 @@ class Notification(models.Model):
             recipient=recipient,
             actor=actor,
             verb='started following you',
-            notification_type='follow',
-            timestamp=timezone.now()
+            notification_type='follow'
         )
     
     @classmethod
     def create_post_notification(cls, recipient, actor, target):
         """Create notification for new posts from followed users"""
+        content_type = ContentType.objects.get_for_model(target)
         return cls.objects.create(
             recipient=recipient,
             actor=actor,
             verb='posted something new',
             notification_type='post',
-            target_content_type=ContentType.objects.get_for_model(target),
-            target_object_id=target.id,
-            timestamp=timezone.now()
-        )
\ No newline at end of file
+            target_content_type=content_type,
+            target_object_id=target.id
+        )
+    
+    @classmethod
+    def create_post_notifications_bulk(cls, recipients, actor, target):
+        """Notify every recipient of a new post with batched multi-row INSERTs"""
+        return cls._create_bulk(recipients, actor, 'posted something new', 'post', target)
+    
+    @classmethod
+    def _create_bulk(cls, recipients, actor, verb, notification_type, target):
+        """One notification per recipient, inserted 1000 rows per statement"""
+        from .cache import clear_notification_counts
+        
+        content_type = ContentType.objects.get_for_model(target)
+        notifications = cls.objects.bulk_create(
+            [
+                cls(
+                    recipient=recipient,
+                    actor=actor,
+                    verb=verb,
+                    notification_type=notification_type,
+                    target_content_type=content_type,
+                    target_object_id=target.id
+                )
+                for recipient in recipients
+            ],
+            batch_size=1000
+        )
+        # bulk_create sends no post_save, so drop the cached counts here
+        clear_notification_counts(*{notification.recipient_id for notification in notifications})
+        return notifications
@@ -3,12 +3,17 @@
 from rest_framework import serializers
 from .models import Notification
 from django.contrib.contenttypes.models import ContentType
+from django.core.files.storage import default_storage
 
 class NotificationSerializer(serializers.ModelSerializer):
     actor_username = serializers.CharField(source='actor.username', read_only=True)
     actor_profile_picture = serializers.SerializerMethodField()
     target_type = serializers.SerializerMethodField()
     target_data = serializers.SerializerMethodField()
+    # The generic target object itself is not JSON serializable; expose its id
+    target = serializers.IntegerField(source='target_object_id', read_only=True)
+    # Kept under its old name for API clients; the column is now timestamp
+    created_at = serializers.DateTimeField(source='timestamp', read_only=True)
     
     class Meta:
         model = Notification
@@ -17,11 +22,17 @@ class NotificationSerializer(serializers.ModelSerializer):
             'verb', 'notification_type', 'target', 'target_type', 'target_data',
             'read', 'created_at'
         ]
-        read_only_fields = ['id', 'recipient', 'actor', 'created_at']
+        # Only 'read' is writable (through NotificationDetailView); everything else is output
+        read_only_fields = [
+            'id', 'recipient', 'actor', 'verb', 'notification_type', 'target'
+        ]
     
     def get_actor_profile_picture(self, obj):
-        if obj.actor.profile_picture:
-            return obj.actor.profile_picture.url
+        # Build the URL from the stored name; FieldFile.url goes through the same
+        # storage call plus its own checks for every row
+        name = obj.actor.profile_picture.name
+        if name:
+            return default_storage.url(name)
         return None
     
     def get_target_type(self, obj):
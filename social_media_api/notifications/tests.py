@@ -1,6 +1,7 @@
 # notifications/tests.py
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
@@ -9,42 +10,48 @@ from posts.models import Post, Comment
 from .models import Notification
 from django.contrib.contenttypes.models import ContentType
 
+# A fast hasher for the fixture users, under manage.py test or pytest alike
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class NotificationTests(APITestCase):
-    def setUp(self):
-        self.user1 = CustomUser.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user1 = CustomUser.objects.create_user(
             username='user1',
             email='user1@test.com',
             password='testpass123'
         )
-        self.user2 = CustomUser.objects.create_user(
+        cls.user2 = CustomUser.objects.create_user(
             username='user2',
             email='user2@test.com',
             password='testpass123'
         )
-        self.user3 = CustomUser.objects.create_user(
+        cls.user3 = CustomUser.objects.create_user(
             username='user3',
             email='user3@test.com',
             password='testpass123'
         )
         
-        self.post = Post.objects.create(
-            author=self.user1,
+        cls.post = Post.objects.create(
+            author=cls.user1,
             title='Test Post',
             content='Test Content'
         )
         
         # Create some notifications
-        Notification.create_follow_notification(self.user1, self.user2)
-        Notification.create_follow_notification(self.user1, self.user3)
+        Notification.create_follow_notification(cls.user1, cls.user2)
+        Notification.create_follow_notification(cls.user1, cls.user3)
         
         # Create a read notification
         notification = Notification.create_like_notification(
-            self.user1,
-            self.user2,
-            self.post
+            cls.user1,
+            cls.user2,
+            cls.post
         )
         notification.mark_as_read()
-        
+    
+    def setUp(self):
+        # The cache outlives each test's rollback; start every test from the database
+        cache.clear()
         self.client.force_authenticate(user=self.user1)
     
     def test_get_notifications_list(self):
@@ -4,8 +4,9 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination
 from django.utils import timezone
+from .cache import clear_notification_counts, get_notification_counts
 from .models import Notification
 from .serializers import (
     NotificationSerializer, 
@@ -13,8 +14,22 @@ from .serializers import (
     NotificationCountSerializer
 )
 
-class NotificationPagination(PageNumberPagination):
-    page_size = 20
+def with_serializer_relations(queryset):
+    """Load what NotificationSerializer reads in a fixed number of queries:
+    actor and content type are joined, targets are prefetched per content type"""
+    return queryset.select_related('actor', 'target_content_type').prefetch_related(
+        'target'
+    ).only(
+        'id', 'recipient_id', 'verb', 'notification_type', 'target_object_id',
+        'read', 'timestamp', 'actor__id', 'actor__username', 'actor__profile_picture',
+        'target_content_type__app_label', 'target_content_type__model'
+    )
+
+class NotificationCursorPagination(CursorPagination):
+    # Keyset pages seek on the (recipient, read, timestamp) index instead of
+    # counting past OFFSET rows, so deep pages cost the same as the first
+    ordering = '-timestamp'
+    page_size = 25
     page_size_query_param = 'page_size'
     max_page_size = 100
 
@@ -22,23 +37,31 @@ class NotificationListView(generics.ListAPIView):
     """View to list all notifications for the authenticated user"""
     permission_classes = [IsAuthenticated]
     serializer_class = NotificationSerializer
-    pagination_class = NotificationPagination
+    pagination_class = NotificationCursorPagination
     
     def get_queryset(self):
-        return Notification.objects.filter(
-            recipient=self.request.user
-        ).select_related('actor', 'recipient').order_by('-created_at')
+        return with_serializer_relations(
+            Notification.objects.filter(recipient=self.request.user)
+        ).order_by('-timestamp')
     
     def get(self, request, *args, **kwargs):
-        # Mark notifications as read when viewed
+        response = super().get(request, *args, **kwargs)
+        
+        # Mark notifications as read when viewed: only the ones on this page,
+        # in one UPDATE, rather than every unread notification the user has
         if request.query_params.get('mark_read', 'false').lower() == 'true':
-            unread_notifications = Notification.objects.filter(
-                recipient=request.user,
-                read=False
-            )
-            unread_notifications.update(read=True)
+            viewed = [item for item in response.data['results'] if not item['read']]
+            if viewed:
+                Notification.objects.filter(
+                    recipient=request.user,
+                    read=False,
+                    id__in=[item['id'] for item in viewed]
+                ).update(read=True)
+                clear_notification_counts(request.user.id)
+                for item in viewed:
+                    item['read'] = True
         
-        return super().get(request, *args, **kwargs)
+        return response
 
 class NotificationDetailView(generics.RetrieveUpdateDestroyAPIView):
     """View to retrieve, update, or delete a specific notification"""
@@ -62,6 +85,7 @@ class MarkAllNotificationsReadView(APIView):
             recipient=request.user,
             read=False
         ).update(read=True)
+        clear_notification_counts(request.user.id)
         
         return Response({
             'message': f'Marked {updated_count} notifications as read',
@@ -87,19 +111,7 @@ class NotificationCountView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        unread_count = Notification.objects.filter(
-            recipient=request.user,
-            read=False
-        ).count()
-        
-        total_count = Notification.objects.filter(
-            recipient=request.user
-        ).count()
-        
-        serializer = NotificationCountSerializer({
-            'unread_count': unread_count,
-            'total_count': total_count
-        })
+        serializer = NotificationCountSerializer(get_notification_counts(request.user.id))
         
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -107,10 +119,9 @@ class UnreadNotificationsView(generics.ListAPIView):
     """View to list only unread notifications"""
     permission_classes = [IsAuthenticated]
     serializer_class = NotificationSerializer
-    pagination_class = NotificationPagination
+    pagination_class = NotificationCursorPagination
     
     def get_queryset(self):
-        return Notification.objects.filter(
-            recipient=self.request.user,
-            read=False
-        ).select_related('actor', 'recipient').order_by('-created_at')
\ No newline at end of file
+        return with_serializer_relations(
+            Notification.objects.filter(recipient=self.request.user, read=False)
+        ).order_by('-timestamp')
\ No newline at end of file
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class PostsConfig(AppConfig):
     name = 'posts'
+    
+    def ready(self):
+        # Register the like/comment counter signals and feed cache invalidation
+        from . import cache, signals  # noqa: F401
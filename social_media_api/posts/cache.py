@@ -0,0 +1,110 @@
+# posts/cache.py
+
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.response import Response
+
+from accounts.models import Follow
+from .models import Post, PostLike
+
+# Trending is the same for every user, so the ranking is computed at most once
+# a minute; counts shown on the posts are still read fresh from the rows
+TRENDING_TIMEOUT = 60
+
+def trending_post_ids_key(days, limit):
+    return f'posts:trending:{days}:{limit}'
+
+def get_trending_post_ids(days, limit):
+    """Ids of the most liked, then most commented, posts of the last `days` days"""
+    return cache.get_or_set(
+        trending_post_ids_key(days, limit),
+        lambda: list(
+            Post.objects.filter(created_at__gte=timezone.now() - timedelta(days=days))
+            .order_by('-like_count', '-comment_count', '-created_at')
+            .values_list('id', flat=True)[:limit]
+        ),
+        TRENDING_TIMEOUT
+    )
+
+# A user's ranked feed is kept while they page through it
+PERSONALIZED_FEED_TIMEOUT = 60
+
+def personalized_feed_ids_key(user_id):
+    return f'posts:feed:{user_id}'
+
+# Serialized feed pages are reused for repeated pulls. Page keys carry a
+# per-user version, so dropping the version key retires all of a user's pages
+# in one delete; the timeout bounds how stale other users' like counts get
+FEED_PAGE_TIMEOUT = 30
+FEED_VERSION_TIMEOUT = 60 * 60 * 24
+
+def feed_version_key(user_id):
+    return f'posts:feed_version:{user_id}'
+
+def get_feed_version(user_id):
+    key = feed_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # A fresh value, so pages cached under an earlier version never match
+        cache.add(key, time.time_ns(), FEED_VERSION_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+def feed_page_key(user_id, feed_name, query_params):
+    query = '&'.join(f'{name}={value}' for name, value in sorted(query_params.items()))
+    return f'posts:feed_page:{user_id}:{get_feed_version(user_id)}:{feed_name}:{query}'
+
+def cache_feed_page(feed_name):
+    """Serve a feed view's successful responses from the cache, per user and query string"""
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            key = feed_page_key(request.user.pk, feed_name, request.query_params)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, FEED_PAGE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
+
+def clear_feeds(*user_ids):
+    """Drop the cached rankings and pages of these users' feeds"""
+    cache.delete_many(
+        [personalized_feed_ids_key(user_id) for user_id in user_ids]
+        + [feed_version_key(user_id) for user_id in user_ids]
+    )
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_feeds(sender, instance, **kwargs):
+    # The post shows in its author's feeds and in their followers'
+    follower_ids = Follow.objects.filter(followed_id=instance.author_id).values_list(
+        'follower_id', flat=True
+    )
+    clear_feeds(instance.author_id, *follower_ids)
+
+@receiver(post_save, sender=PostLike)
+@receiver(post_delete, sender=PostLike)
+def invalidate_liker_feeds(sender, instance, **kwargs):
+    # is_liked on the liker's cached pages
+    clear_feeds(instance.user_id)
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_follower_feeds(sender, instance, **kwargs):
+    clear_feeds(instance.follower_id)
+
+@receiver(m2m_changed, sender=Follow)
+def invalidate_feeds_on_follow_change(sender, instance, action, pk_set, **kwargs):
+    # following.add()/remove() from either side; both ends' feeds are dropped
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        clear_feeds(instance.pk, *(pk_set or ()))
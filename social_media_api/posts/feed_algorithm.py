@@ -1,61 +1,134 @@
 # posts/feed_algorithm.py
 
-from django.db.models import Count, Q, F
+from django.core.cache import cache
+from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
+from operator import itemgetter
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
-from .models import Post
-from .serializers import PostSerializer
+from accounts.models import followed_user_ids
+from .cache import (
+    PERSONALIZED_FEED_TIMEOUT, get_trending_post_ids, personalized_feed_ids_key
+)
+from .models import Comment, Post, PostLike, with_liked_flag, with_list_columns
+from .serializers import PostListSerializer
 
 class FeedAlgorithm:
+    # Recent candidates ranked per request; only the top `limit` are loaded in full
+    CANDIDATE_LIMIT = 500
+    # Likes and comments only count towards the ranking for this many days
+    ENGAGEMENT_DAYS = 7
+    # Weight of each ranking in the combined (Borda) rank, lower ranks first
+    DEFAULT_WEIGHTS = {'likes': 1.0, 'comments': 3.0, 'recency': 1.0}
+    
     @staticmethod
-    def get_personalized_feed(user, limit=50):
+    def rank_by(candidates, key):
         """
-        Get personalized feed based on user's interactions
+        Position of each candidate id when sorted by key, highest first;
+        candidates with equal keys share the better position.
         """
-        # Get users the current user follows
-        following_users = user.following.all()
-        
-        # Start with posts from followed users
-        posts = Post.objects.filter(
-            Q(author__in=following_users) | Q(author=user)
+        ranks = {}
+        previous = rank = None
+        for position, candidate in enumerate(sorted(candidates, key=key, reverse=True)):
+            value = key(candidate)
+            if value != previous:
+                previous, rank = value, position
+            ranks[candidate['id']] = rank
+        return ranks
+    
+    @staticmethod
+    def recent_counts(model, post_ids, since):
+        """
+        Number of model rows (likes or comments) per post in post_ids created since `since`
+        """
+        return dict(
+            model.objects.filter(post_id__in=post_ids, created_at__gte=since)
+            .order_by().values('post_id').annotate(count=Count('*'))
+            .values_list('post_id', 'count')
         )
+    
+    @staticmethod
+    def rank_personalized_feed(user, limit=50, weights=None):
+        """
+        Ids of the user's personalized feed, best first
+        """
+        # Get users the current user follows, as a subquery on the follow table
+        following_ids = followed_user_ids(user)
+        
+        # Phase one: the newest posts from followed users and the user's own;
+        # a bounded, index-friendly scan however many users are followed
+        candidates = list(Post.objects.filter(
+            Q(author_id__in=following_ids) | Q(author=user)
+        ).order_by('-created_at').values('id', 'created_at')[:FeedAlgorithm.CANDIDATE_LIMIT])
         
-        # Boost posts with recent interactions
-        recent_posts = posts.annotate(
-            recent_likes=Count('likes', filter=Q(
-                likes__liked_posts__created_at__gte=timezone.now() - timedelta(days=7)
-            )),
-            recent_comments=Count('comments', filter=Q(
-                comments__created_at__gte=timezone.now() - timedelta(days=7)
-            ))
-        ).order_by(
-            '-recent_likes',
-            '-recent_comments',
-            '-created_at'
-        )[:limit]
+        # Likes and comments from the last week, counted for the candidates only
+        candidate_ids = [candidate['id'] for candidate in candidates]
+        since = timezone.now() - timedelta(days=FeedAlgorithm.ENGAGEMENT_DAYS)
+        recent_likes = FeedAlgorithm.recent_counts(PostLike, candidate_ids, since)
+        recent_comments = FeedAlgorithm.recent_counts(Comment, candidate_ids, since)
+        for candidate in candidates:
+            candidate['recent_likes'] = recent_likes.get(candidate['id'], 0)
+            candidate['recent_comments'] = recent_comments.get(candidate['id'], 0)
         
-        return recent_posts
+        # Rank the candidates by recent likes, recent comments and recency and
+        # combine the weighted positions
+        weights = {**FeedAlgorithm.DEFAULT_WEIGHTS, **(weights or {})}
+        rankings = [
+            (weights['likes'], FeedAlgorithm.rank_by(candidates, itemgetter('recent_likes'))),
+            (weights['comments'], FeedAlgorithm.rank_by(candidates, itemgetter('recent_comments'))),
+            (weights['recency'], FeedAlgorithm.rank_by(candidates, itemgetter('created_at'))),
+        ]
+        # Candidates are newest first, and the stable sort keeps that order on ties
+        return [candidate['id'] for candidate in sorted(
+            candidates,
+            key=lambda candidate: sum(weight * ranks[candidate['id']] for weight, ranks in rankings)
+        )[:limit]]
+    
+    @staticmethod
+    def get_personalized_feed_ids(user):
+        """
+        Ranked personalized feed ids, kept for a minute so paging through
+        the feed does not rank it again
+        """
+        return cache.get_or_set(
+            personalized_feed_ids_key(user.pk),
+            lambda: FeedAlgorithm.rank_personalized_feed(user),
+            PERSONALIZED_FEED_TIMEOUT
+        )
+    
+    @staticmethod
+    def get_trending_post_ids(days=7, limit=20):
+        """
+        Ranked trending ids, shared by all users through the cache
+        """
+        return get_trending_post_ids(days, limit)
+    
+    @staticmethod
+    def load_posts(post_ids, user):
+        """
+        Phase two: the posts for post_ids, in that order, ready for PostListSerializer
+        """
+        posts = with_list_columns(with_liked_flag(Post.objects.all(), user)).in_bulk(post_ids)
+        # Posts deleted since the ranking was made are skipped
+        return [posts[post_id] for post_id in post_ids if post_id in posts]
+    
+    @staticmethod
+    def get_personalized_feed(user, limit=50, weights=None):
+        """
+        Get personalized feed based on user's interactions
+        """
+        return FeedAlgorithm.load_posts(
+            FeedAlgorithm.rank_personalized_feed(user, limit, weights), user
+        )
     
     @staticmethod
     def get_trending_posts(user, days=7, limit=20):
         """
         Get trending posts (not necessarily from followed users)
         """
-        trending_posts = Post.objects.filter(
-            created_at__gte=timezone.now() - timedelta(days=days)
-        ).annotate(
-            total_likes=Count('likes'),
-            total_comments=Count('comments')
-        ).order_by(
-            '-total_likes',
-            '-total_comments',
-            '-created_at'
-        )[:limit]
-        
-        return trending_posts
+        return FeedAlgorithm.load_posts(FeedAlgorithm.get_trending_post_ids(days, limit), user)
 
 # Update the FeedView to use the algorithm
 class PersonalizedFeedView(APIView):
@@ -74,7 +147,7 @@ class PersonalizedFeedView(APIView):
         paginator.page_size = 20
         result_page = paginator.paginate_queryset(posts, request)
         
-        serializer = PostSerializer(
+        serializer = PostListSerializer(
             result_page,
             many=True,
             context={'request': request}
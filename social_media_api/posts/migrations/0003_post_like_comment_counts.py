@@ -0,0 +1,59 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, field_name):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field_name: OuterRef('pk')})
+            .order_by().values(field_name)
+            .annotate(count=Count('*')).values('count')
+        ),
+        0
+    )
+
+
+def backfill_counts(apps, schema_editor):
+    """
+    Fill the new counters from the existing likes and comments,
+    one UPDATE per table.
+    """
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    Like = apps.get_model('posts', 'Like')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Post.objects.update(comment_count=count_subquery(Comment.objects, 'post'))
+    for model in (Post, Comment):
+        content_type = ContentType.objects.filter(
+            app_label='posts', model=model._meta.model_name
+        ).first()
+        if content_type is not None:
+            likes = Like.objects.filter(content_type=content_type)
+            model.objects.update(like_count=count_subquery(likes, 'object_id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0002_remove_comment_likes_remove_post_likes_like'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 4.2.30 on 2026-10-16 13:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import OuterRef, Subquery
+
+
+def copy_likes(apps, schema_editor):
+    """
+    Copy the generic likes into the per-model tables, then restore their
+    timestamps with one UPDATE per table (auto_now_add overwrites them on insert).
+    Likes whose post or comment no longer exists are dropped.
+    """
+    Like = apps.get_model('posts', 'Like')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    for model_name, like_model_name in (('post', 'PostLike'), ('comment', 'CommentLike')):
+        content_type = ContentType.objects.filter(app_label='posts', model=model_name).first()
+        if content_type is None:
+            continue
+        model = apps.get_model('posts', model_name)
+        like_model = apps.get_model('posts', like_model_name)
+        likes = Like.objects.filter(
+            content_type=content_type, object_id__in=model.objects.values('pk')
+        )
+        like_model.objects.bulk_create(
+            [
+                like_model(user_id=user_id, **{f'{model_name}_id': object_id})
+                for user_id, object_id in likes.values_list('user_id', 'object_id').iterator()
+            ],
+            batch_size=1000,
+        )
+        like_model.objects.update(created_at=Subquery(
+            likes.filter(user=OuterRef('user'), object_id=OuterRef(model_name))
+            .values('created_at')[:1]
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('posts', '0003_post_like_comment_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentLike',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('comment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='likes', to='posts.comment')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comment_likes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PostLike',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='likes', to='posts.post')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='post_likes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='postlike',
+            index=models.Index(fields=['post', 'created_at'], name='postlike_post_created_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='postlike',
+            unique_together={('user', 'post')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='commentlike',
+            unique_together={('user', 'comment')},
+        ),
+        migrations.RunPython(copy_likes, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='Like',
+        ),
+    ]
@@ -2,8 +2,7 @@
 
 from django.db import models
 from django.conf import settings
-from django.contrib.contenttypes.fields import GenericForeignKey
-from django.contrib.contenttypes.models import ContentType
+from django.db.models import Exists, OuterRef, Prefetch
 
 class Post(models.Model):
     author = models.ForeignKey(
@@ -20,34 +19,25 @@ class Post(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Kept in step by the like/comment signals in posts/signals.py
+    like_count = models.PositiveIntegerField(default=0, db_index=True, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, db_index=True, editable=False)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Feeds filter on the followed authors and read newest first
+            models.Index(fields=['author', '-created_at'], name='post_author_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} by {self.author.username}"
     
-    @property
-    def like_count(self):
-        """Get the number of likes on this post"""
-        return Like.objects.filter(
-            content_type=ContentType.objects.get_for_model(Post),
-            object_id=self.id
-        ).count()
-    
-    @property
-    def comment_count(self):
-        return self.comments.count()
-    
     def user_has_liked(self, user):
         """Check if a user has liked this post"""
         if not user.is_authenticated:
             return False
-        return Like.objects.filter(
-            user=user,
-            content_type=ContentType.objects.get_for_model(Post),
-            object_id=self.id
-        ).exists()
+        return self.likes.filter(user=user).exists()
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -63,6 +53,7 @@ class Comment(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    like_count = models.PositiveIntegerField(default=0, editable=False)
     
     class Meta:
         ordering = ['created_at']
@@ -70,46 +61,79 @@ class Comment(models.Model):
     def __str__(self):
         return f"Comment by {self.author.username} on {self.post.title}"
     
-    @property
-    def like_count(self):
-        """Get the number of likes on this comment"""
-        return Like.objects.filter(
-            content_type=ContentType.objects.get_for_model(Comment),
-            object_id=self.id
-        ).count()
-    
     def user_has_liked(self, user):
         """Check if a user has liked this comment"""
         if not user.is_authenticated:
             return False
-        return Like.objects.filter(
-            user=user,
-            content_type=ContentType.objects.get_for_model(Comment),
-            object_id=self.id
-        ).exists()
+        return self.likes.filter(user=user).exists()
 
-class Like(models.Model):
-    """Model to track likes on posts and comments"""
+class PostLike(models.Model):
+    """A user's like on a post"""
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        related_name='post_likes'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
         related_name='likes'
     )
-    
-    # Generic foreign key to allow liking both posts and comments
-    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
-    object_id = models.PositiveIntegerField()
-    content_object = GenericForeignKey('content_type', 'object_id')
-    
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
-        unique_together = ['user', 'content_type', 'object_id']
+        unique_together = ['user', 'post']
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['content_type', 'object_id']),
-            models.Index(fields=['user', 'content_type', 'object_id']),
+            # Likes list and the feed's recent-likes count filter by post and time
+            models.Index(fields=['post', 'created_at'], name='postlike_post_created_idx'),
         ]
     
     def __str__(self):
-        return f"{self.user.username} liked {self.content_object}"
\ No newline at end of file
+        return f"{self.user.username} liked {self.post}"
+
+class CommentLike(models.Model):
+    """A user's like on a comment"""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='comment_likes'
+    )
+    comment = models.ForeignKey(
+        Comment,
+        on_delete=models.CASCADE,
+        related_name='likes'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        unique_together = ['user', 'comment']
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.user.username} liked {self.comment}"
+
+def with_liked_flag(queryset, user):
+    """Annotate posts or comments with is_liked_flag: whether user has liked each row"""
+    if not user.is_authenticated:
+        # The serializers answer False for anonymous users without a query
+        return queryset
+    like_field = queryset.model.likes.field
+    return queryset.annotate(is_liked_flag=Exists(like_field.model.objects.filter(
+        user=user,
+        **{like_field.name: OuterRef('pk')}
+    )))
+
+def with_comments(queryset, user):
+    """Prefetch the comments PostSerializer nests, with their authors and
+    is_liked flags, in one query for the whole page"""
+    comments = with_liked_flag(Comment.objects.select_related('author'), user)
+    return queryset.prefetch_related(Prefetch('comments', queryset=comments))
+
+def with_list_columns(queryset):
+    """Load only the columns PostListSerializer reads, with the author's
+    username joined, so feed pages do not pull post bodies"""
+    return queryset.select_related('author').only(
+        'id', 'author__id', 'author__username', 'title', 'image', 'created_at',
+        'like_count', 'comment_count'
+    )
\ No newline at end of file
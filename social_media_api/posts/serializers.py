@@ -1,9 +1,9 @@
 # posts/serializers.py
 
 from rest_framework import serializers
+from django.core.files.storage import default_storage
 from .models import Post, Comment
-from django.contrib.contenttypes.models import ContentType
-from .models import Like
+from .models import PostLike
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -20,14 +20,17 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'author', 'created_at', 'updated_at', 'post']
     
     def get_is_liked(self, obj):
+        # Annotated by with_liked_flag(); other callers fall back to a query
+        if hasattr(obj, 'is_liked_flag'):
+            return obj.is_liked_flag
         request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.likes.filter(id=request.user.id).exists()
+        if request:
+            return obj.user_has_liked(request.user)
         return False
 
-class PostSerializer(serializers.ModelSerializer):
+class PostListSerializer(serializers.ModelSerializer):
+    """Post without its body and comments, for the feeds"""
     author_username = serializers.CharField(source='author.username', read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
     comment_count = serializers.IntegerField(read_only=True)
     like_count = serializers.IntegerField(read_only=True)
     is_liked = serializers.SerializerMethodField()
@@ -35,18 +38,32 @@ class PostSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
         fields = [
-            'id', 'author', 'author_username', 'title', 'content', 'image',
-            'created_at', 'updated_at', 'likes', 'comments',
+            'id', 'author', 'author_username', 'title', 'image', 'created_at',
             'comment_count', 'like_count', 'is_liked'
         ]
-        read_only_fields = ['id', 'author', 'created_at', 'updated_at', 'likes']
+        read_only_fields = fields
     
     def get_is_liked(self, obj):
+        # Annotated by with_liked_flag(); other callers fall back to a query
+        if hasattr(obj, 'is_liked_flag'):
+            return obj.is_liked_flag
         request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.likes.filter(id=request.user.id).exists()
+        if request:
+            return obj.user_has_liked(request.user)
         return False
 
+class PostSerializer(PostListSerializer):
+    comments = CommentSerializer(many=True, read_only=True)
+    
+    class Meta:
+        model = Post
+        fields = [
+            'id', 'author', 'author_username', 'title', 'content', 'image',
+            'created_at', 'updated_at', 'comments',
+            'comment_count', 'like_count', 'is_liked'
+        ]
+        read_only_fields = ['id', 'author', 'created_at', 'updated_at']
+
 class PostCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
@@ -62,33 +79,40 @@ class LikeSerializer(serializers.ModelSerializer):
     user_profile_picture = serializers.SerializerMethodField()
     
     class Meta:
-        model = Like
+        model = PostLike
         fields = ['id', 'user', 'user_username', 'user_profile_picture', 'created_at']
         read_only_fields = ['id', 'user', 'created_at']
     
     def get_user_profile_picture(self, obj):
-        if obj.user.profile_picture:
-            return obj.user.profile_picture.url
+        # Build the URL from the stored name, as NotificationSerializer does,
+        # instead of going through FieldFile.url for every row
+        name = obj.user.profile_picture.name
+        if name:
+            return default_storage.url(name)
         return None
 
 class LikeCreateSerializer(serializers.Serializer):
+    LIKEABLE_MODELS = {'post': Post, 'comment': Comment}
+    
     content_type = serializers.CharField(required=True)
     object_id = serializers.IntegerField(required=True)
     
     def validate(self, data):
         # Validate content_type
-        try:
-            content_type = ContentType.objects.get(model=data['content_type'])
-            data['content_type'] = content_type
-        except ContentType.DoesNotExist:
+        model_class = self.LIKEABLE_MODELS.get(data['content_type'])
+        if model_class is None:
             raise serializers.ValidationError("Invalid content type")
         
         # Validate object exists
-        model_class = content_type.model_class()
         try:
             obj = model_class.objects.get(id=data['object_id'])
             data['object'] = obj
         except model_class.DoesNotExist:
             raise serializers.ValidationError("Object does not exist")
         
-        return data
\ No newline at end of file
+        return data
+
+class FeedFilterSerializer(serializers.Serializer):
+    """Optional created_at range for FeedView, parsed to aware datetimes"""
+    start_date = serializers.DateTimeField(required=False)
+    end_date = serializers.DateTimeField(required=False)
@@ -0,0 +1,35 @@
+# posts/signals.py
+
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Comment, CommentLike, Post, PostLike
+
+def liked_rows(like):
+    """The post or comment a like counts towards, as a queryset to update()"""
+    if isinstance(like, PostLike):
+        return Post.objects.filter(pk=like.post_id)
+    return Comment.objects.filter(pk=like.comment_id)
+
+@receiver(post_save, sender=PostLike)
+@receiver(post_save, sender=CommentLike)
+def increment_like_count(sender, instance, created, **kwargs):
+    if created:
+        liked_rows(instance).update(like_count=F('like_count') + 1)
+
+@receiver(post_delete, sender=PostLike)
+@receiver(post_delete, sender=CommentLike)
+def decrement_like_count(sender, instance, **kwargs):
+    liked_rows(instance).filter(like_count__gt=0).update(like_count=F('like_count') - 1)
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(comment_count=F('comment_count') + 1)
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
@@ -1,57 +1,61 @@
 # posts/tests_likes.py
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
-from django.contrib.contenttypes.models import ContentType
 from accounts.models import CustomUser
-from posts.models import Post, Comment, Like
+from posts.models import Post, Comment, PostLike
 from notifications.models import Notification
 
+# A fast hasher for the fixture users, under manage.py test or pytest alike
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class LikeTests(APITestCase):
-    def setUp(self):
-        self.user1 = CustomUser.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user1 = CustomUser.objects.create_user(
             username='user1',
             email='user1@test.com',
             password='testpass123'
         )
-        self.user2 = CustomUser.objects.create_user(
+        cls.user2 = CustomUser.objects.create_user(
             username='user2',
             email='user2@test.com',
             password='testpass123'
         )
         
-        self.post = Post.objects.create(
-            author=self.user1,
+        cls.post = Post.objects.create(
+            author=cls.user1,
             title='Test Post',
             content='Test Content'
         )
         
-        self.comment = Comment.objects.create(
-            post=self.post,
-            author=self.user2,
+        cls.comment = Comment.objects.create(
+            post=cls.post,
+            author=cls.user2,
             content='Test Comment'
         )
-        
+    
+    def setUp(self):
+        # The cache outlives each test's rollback; start every test from the database
+        cache.clear()
         self.client.force_authenticate(user=self.user2)
     
     def test_like_post(self):
         """Test liking a post"""
         url = reverse('like-post', kwargs={'post_id': self.post.id})
-        response = self.client.post(url)
+        # Notifications are created once the like commits
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url)
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['message'], 'Post liked successfully')
+        self.post.refresh_from_db()
         self.assertEqual(self.post.like_count, 1)
         
         # Check if like was created
-        content_type = ContentType.objects.get_for_model(Post)
-        self.assertTrue(Like.objects.filter(
-            user=self.user2,
-            content_type=content_type,
-            object_id=self.post.id
-        ).exists())
+        self.assertTrue(PostLike.objects.filter(user=self.user2, post=self.post).exists())
         
         # Check if notification was created
         self.assertEqual(Notification.objects.count(), 1)
@@ -60,13 +64,29 @@ class LikeTests(APITestCase):
         self.assertEqual(notification.actor, self.user2)
         self.assertEqual(notification.notification_type, 'like')
     
+    def test_like_notification_waits_for_commit(self):
+        """Test that the like notification is only created once the like commits"""
+        url = reverse('like-post', kwargs={'post_id': self.post.id})
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Notification.objects.count(), 0)
+        self.assertEqual(len(callbacks), 1)
+        
+        callbacks[0]()
+        self.assertEqual(Notification.objects.filter(recipient=self.user1).count(), 1)
+    
     def test_like_own_post_no_notification(self):
         """Test that liking own post doesn't create notification"""
         self.client.force_authenticate(user=self.user1)
         url = reverse('like-post', kwargs={'post_id': self.post.id})
-        response = self.client.post(url)
+        # Notifications are created once the like commits
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url)
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.post.refresh_from_db()
         self.assertEqual(self.post.like_count, 1)
         self.assertEqual(Notification.objects.count(), 0)  # No notification for own like
     
@@ -86,18 +106,14 @@ class LikeTests(APITestCase):
     def test_unlike_post(self):
         """Test unliking a post"""
         # First like the post
-        content_type = ContentType.objects.get_for_model(Post)
-        Like.objects.create(
-            user=self.user2,
-            content_type=content_type,
-            object_id=self.post.id
-        )
+        PostLike.objects.create(user=self.user2, post=self.post)
         
         url = reverse('unlike-post', kwargs={'post_id': self.post.id})
         response = self.client.post(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['message'], 'Post unliked successfully')
+        self.post.refresh_from_db()
         self.assertEqual(self.post.like_count, 0)
     
     def test_like_comment(self):
@@ -107,6 +123,7 @@ class LikeTests(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['message'], 'Comment liked successfully')
+        self.comment.refresh_from_db()
         self.assertEqual(self.comment.like_count, 1)
     
     def test_get_post_likes_list(self):
@@ -118,9 +135,8 @@ class LikeTests(APITestCase):
             password='testpass123'
         )
         
-        content_type = ContentType.objects.get_for_model(Post)
-        Like.objects.create(user=self.user2, content_type=content_type, object_id=self.post.id)
-        Like.objects.create(user=user3, content_type=content_type, object_id=self.post.id)
+        PostLike.objects.create(user=self.user2, post=self.post)
+        PostLike.objects.create(user=user3, post=self.post)
         
         url = reverse('post-likes-list', kwargs={'post_id': self.post.id})
         response = self.client.get(url)
@@ -4,20 +4,24 @@ from rest_framework import viewsets, status, filters, generics
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Post, Comment
+from .models import Post, Comment, with_comments, with_list_columns, with_liked_flag
 from .serializers import (
-    PostSerializer, PostCreateSerializer,
-    CommentSerializer, CommentCreateSerializer
+    PostSerializer, PostListSerializer, PostCreateSerializer,
+    CommentSerializer, CommentCreateSerializer, FeedFilterSerializer
 )
+from .cache import cache_feed_page
+from .feed_algorithm import FeedAlgorithm
 from .permissions import IsOwnerOrReadOnly
+from django.db import transaction
+from django.shortcuts import get_object_or_404
 from django.db.models import Q
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.views import APIView
-from django.contrib.contenttypes.models import ContentType
-from .models import Like
+from .models import CommentLike, PostLike
 from .serializers import LikeSerializer, LikeCreateSerializer
+from accounts.models import followed_user_ids
 from notifications.models import Notification 
 
 
@@ -27,8 +31,13 @@ class PostPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+class FeedCursorPagination(CursorPagination):
+    # Keyset pages seek on post_author_created_idx instead of counting the
+    # feed and skipping OFFSET rows, so deep pages cost the same as the first
+    ordering = '-created_at'
+    page_size = 20
+
 class PostViewSet(viewsets.ModelViewSet):
-    queryset = Post.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     pagination_class = PostPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -36,78 +45,45 @@ class PostViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'updated_at']
     ordering = ['-created_at']
     
+    def get_queryset(self):
+        # is_liked comes back as a subquery column instead of a query per post;
+        # nested comments are one prefetch
+        return with_comments(with_liked_flag(
+            Post.objects.select_related('author'), self.request.user
+        ), self.request.user)
+    
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return PostCreateSerializer
+        if self.action == 'feed':
+            return PostListSerializer
         return PostSerializer
     
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
-    
-    @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
-    def like(self, request, pk=None):
-        post = self.get_object()
-        user = request.user
-        
-        if post.likes.filter(id=user.id).exists():
-            post.likes.remove(user)
-            liked = False
-            message = 'Post unliked'
-        else:
-            post.likes.add(user)
-            liked = True
-            message = 'Post liked'
-        
-        return Response({
-            'liked': liked,
-            'like_count': post.like_count,
-            'message': message
-        })
-    
-    @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
-    def comment(self, request, pk=None):
-        post = self.get_object()
-        serializer = CommentCreateSerializer(data=request.data)
-        
-        if serializer.is_valid():
-            comment = serializer.save(author=request.user, post=post)
-            return Response(CommentSerializer(comment, context={'request': request}).data,
-                          status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            post = serializer.save(author=self.request.user)
+            # Fan out to followers in batched INSERTs rather than one per follower,
+            # once the post is committed
+            transaction.on_commit(lambda: Notification.create_post_notifications_bulk(
+                recipients=self.request.user.followers.all(),
+                actor=self.request.user,
+                target=post
+            ))
     
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
-    def feed(self, request):
-        # Get posts from followed users
-        following_users = request.user.following.all()
-        posts = Post.objects.filter(author__in=following_users)
-        
-        page = self.paginate_queryset(posts)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(posts, many=True)
-        return Response(serializer.data)
-    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    @cache_feed_page('posts')
     def feed(self, request):
         """
         Get posts from users that the current user follows.
         Includes user's own posts and posts from followed users.
         """
-        # Get users that the current user follows
-        following_users = request.user.following.all()
-        
-        # Get the current user's ID
-        current_user_id = request.user.id
+        # Followed users stay a subquery, so their ids never leave the database
+        following_ids = followed_user_ids(request.user)
         
-        # Create a list of user IDs to include in the feed
-        user_ids = [current_user_id]  # Include own posts
-        user_ids.extend(following_users.values_list('id', flat=True))
-        
-        # Get posts from these users
-        posts = Post.objects.filter(
-            author_id__in=user_ids
-        ).select_related('author').prefetch_related('comments', 'likes')
+        # Get posts from these users, plus the user's own
+        posts = with_list_columns(with_liked_flag(Post.objects.filter(
+            Q(author_id=request.user.id) | Q(author_id__in=following_ids)
+        ), request.user))
         
         # Apply pagination
         page = self.paginate_queryset(posts)
@@ -117,30 +93,32 @@ class PostViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(posts, many=True)
         return Response(serializer.data)
+    
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def comment(self, request, pk=None):
         post = self.get_object()
         serializer = CommentCreateSerializer(data=request.data)
         
         if serializer.is_valid():
-            comment = serializer.save(author=request.user, post=post)
-            
-            # Create notification for post author (if not commenting on own post)
-            if post.author != request.user:
-                from notifications.models import Notification
-                Notification.create_comment_notification(
-                    recipient=post.author,
-                    actor=request.user,
-                    target=post,
-                    comment_text=comment.content
-                )
+            with transaction.atomic():
+                comment = serializer.save(author=request.user, post=post)
+                
+                # Notify the post author (if not commenting on own post) once
+                # the comment is committed; recipients go out in one batched INSERT
+                if post.author != request.user:
+                    transaction.on_commit(lambda: Notification.create_comment_notifications_bulk(
+                        recipients=[post.author],
+                        actor=request.user,
+                        target=post,
+                        comment_text=comment.content
+                    ))
             
             return Response(CommentSerializer(comment, context={'request': request}).data,
                           status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class CommentViewSet(viewsets.ModelViewSet):
-    queryset = Comment.objects.all()
+    queryset = Comment.objects.select_related('author')
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     
     def get_serializer_class(self):
@@ -149,7 +127,7 @@ class CommentViewSet(viewsets.ModelViewSet):
         return CommentSerializer
     
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = with_liked_flag(super().get_queryset(), self.request.user)
         post_id = self.request.query_params.get('post_id')
         if post_id:
             queryset = queryset.filter(post_id=post_id)
@@ -157,26 +135,6 @@ class CommentViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
-    
-    @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
-    def like(self, request, pk=None):
-        comment = self.get_object()
-        user = request.user
-        
-        if comment.likes.filter(id=user.id).exists():
-            comment.likes.remove(user)
-            liked = False
-            message = 'Comment unliked'
-        else:
-            comment.likes.add(user)
-            liked = True
-            message = 'Comment liked'
-        
-        return Response({
-            'liked': liked,
-            'like_count': comment.like_count,
-            'message': message
-        })
 
 class FeedView(APIView):
     permission_classes = [IsAuthenticated]
@@ -185,23 +143,22 @@ class FeedView(APIView):
         """
         Enhanced feed view with filtering options
         """
-        # Get following users
-        following_users = request.user.following.all()
-        
-        # Create Q objects for the query
-        queries = Q(author=request.user)  # Include own posts
-        
-        if following_users.exists():
-            queries |= Q(author__in=following_users)
-        
-        # Get posts with optimizations
-        posts = Post.objects.filter(queries).select_related('author').prefetch_related(
-            'comments', 'likes', 'comments__author'
-        ).order_by('-created_at')
-        
-        # Apply filters if provided
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
+        # Own posts plus followed users' posts; the followed users are a
+        # subquery, so no separate query checks whether there are any
+        queries = Q(author=request.user) | Q(author_id__in=followed_user_ids(request.user))
+        
+        # Get posts with optimizations; feed pages leave out post bodies and comments.
+        # FeedCursorPagination orders them newest first
+        posts = with_list_columns(with_liked_flag(
+            Post.objects.filter(queries), request.user
+        ))
+        
+        # Apply filters if provided; parsed once up front, so a bad date is a
+        # 400 and the query gets datetime parameters for the index range
+        date_range = FeedFilterSerializer(data=request.query_params)
+        date_range.is_valid(raise_exception=True)
+        start_date = date_range.validated_data.get('start_date')
+        end_date = date_range.validated_data.get('end_date')
         
         if start_date:
             posts = posts.filter(created_at__gte=start_date)
@@ -209,11 +166,10 @@ class FeedView(APIView):
             posts = posts.filter(created_at__lte=end_date)
         
         # Paginate results
-        paginator = PageNumberPagination()
-        paginator.page_size = 20
+        paginator = FeedCursorPagination()
         result_page = paginator.paginate_queryset(posts, request)
         
-        serializer = PostSerializer(
+        serializer = PostListSerializer(
             result_page, 
             many=True, 
             context={'request': request}
@@ -226,43 +182,29 @@ class LikePostView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request, post_id):
-        try:
-            post = Post.objects.get(id=post_id)
-        except Post.DoesNotExist:
-            return Response(
-                {'error': 'Post not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        post = get_object_or_404(Post.objects.only('id', 'author_id'), id=post_id)
         
-        # Check if user already liked the post
-        content_type = ContentType.objects.get_for_model(Post)
-        like_exists = Like.objects.filter(
-            user=request.user,
-            content_type=content_type,
-            object_id=post.id
-        ).exists()
+        # Create the like; the unique (user, post) constraint settles
+        # concurrent requests for the same like
+        with transaction.atomic():
+            like, created = PostLike.objects.get_or_create(user=request.user, post=post)
+            
+            # Notify the post author (if not liking own post) once the like is committed
+            if created and post.author_id != request.user.id:
+                transaction.on_commit(lambda: Notification.create_like_notification(
+                    recipient=post.author,
+                    actor=request.user,
+                    target=post
+                ))
         
-        if like_exists:
+        if not created:
             return Response(
                 {'error': 'You have already liked this post'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Create the like
-        like = Like.objects.create(
-            user=request.user,
-            content_type=content_type,
-            object_id=post.id
-        )
-        
-        # Create notification for post author (if not liking own post)
-        if post.author != request.user:
-            Notification.create_like_notification(
-                recipient=post.author,
-                actor=request.user,
-                target=post
-            )
-        
+        # The like signals updated the stored counter; read it back
+        post.refresh_from_db(fields=['like_count'])
         return Response({
             'message': 'Post liked successfully',
             'like_id': like.id,
@@ -274,22 +216,13 @@ class UnlikePostView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request, post_id):
-        try:
-            post = Post.objects.get(id=post_id)
-        except Post.DoesNotExist:
-            return Response(
-                {'error': 'Post not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        post = get_object_or_404(Post.objects.only('id'), id=post_id)
         
         # Remove the like
-        content_type = ContentType.objects.get_for_model(Post)
-        Like.objects.filter(
-            user=request.user,
-            content_type=content_type,
-            object_id=post.id
-        ).delete()
+        PostLike.objects.filter(user=request.user, post=post).delete()
         
+        # The like signals updated the stored counter; read it back
+        post.refresh_from_db(fields=['like_count'])
         return Response({
             'message': 'Post unliked successfully',
             'like_count': post.like_count
@@ -300,43 +233,29 @@ class LikeCommentView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request, comment_id):
-        try:
-            comment = Comment.objects.get(id=comment_id)
-        except Comment.DoesNotExist:
-            return Response(
-                {'error': 'Comment not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        comment = get_object_or_404(Comment.objects.only('id', 'author_id'), id=comment_id)
         
-        # Check if user already liked the comment
-        content_type = ContentType.objects.get_for_model(Comment)
-        like_exists = Like.objects.filter(
-            user=request.user,
-            content_type=content_type,
-            object_id=comment.id
-        ).exists()
+        # Create the like; the unique (user, comment) constraint settles
+        # concurrent requests for the same like
+        with transaction.atomic():
+            like, created = CommentLike.objects.get_or_create(user=request.user, comment=comment)
+            
+            # Notify the comment author (if not liking own comment) once the like is committed
+            if created and comment.author_id != request.user.id:
+                transaction.on_commit(lambda: Notification.create_like_notification(
+                    recipient=comment.author,
+                    actor=request.user,
+                    target=comment
+                ))
         
-        if like_exists:
+        if not created:
             return Response(
                 {'error': 'You have already liked this comment'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Create the like
-        like = Like.objects.create(
-            user=request.user,
-            content_type=content_type,
-            object_id=comment.id
-        )
-        
-        # Create notification for comment author (if not liking own comment)
-        if comment.author != request.user:
-            Notification.create_like_notification(
-                recipient=comment.author,
-                actor=request.user,
-                target=comment
-            )
-        
+        # The like signals updated the stored counter; read it back
+        comment.refresh_from_db(fields=['like_count'])
         return Response({
             'message': 'Comment liked successfully',
             'like_id': like.id,
@@ -348,22 +267,13 @@ class UnlikeCommentView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request, comment_id):
-        try:
-            comment = Comment.objects.get(id=comment_id)
-        except Comment.DoesNotExist:
-            return Response(
-                {'error': 'Comment not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        comment = get_object_or_404(Comment.objects.only('id'), id=comment_id)
         
         # Remove the like
-        content_type = ContentType.objects.get_for_model(Comment)
-        Like.objects.filter(
-            user=request.user,
-            content_type=content_type,
-            object_id=comment.id
-        ).delete()
+        CommentLike.objects.filter(user=request.user, comment=comment).delete()
         
+        # The like signals updated the stored counter; read it back
+        comment.refresh_from_db(fields=['like_count'])
         return Response({
             'message': 'Comment unliked successfully',
             'like_count': comment.like_count
@@ -376,36 +286,33 @@ class PostLikesListView(generics.ListAPIView):
     
     def get_queryset(self):
         post_id = self.kwargs['post_id']
-        content_type = ContentType.objects.get_for_model(Post)
-        return Like.objects.filter(
-            content_type=content_type,
-            object_id=post_id
-        ).select_related('user')
+        return PostLike.objects.filter(post_id=post_id).select_related('user')
 
 
 class PersonalizedFeedView(APIView):
     permission_classes = [IsAuthenticated]
     
+    @cache_feed_page('personalized')
     def get(self, request):
         feed_type = request.query_params.get('type', 'personalized')
         
+        # Both feeds are ranked id lists held in the cache; pages slice the
+        # list, so no page re-ranks the feed or makes the database skip rows
         if feed_type == 'trending':
-            # Import the FeedAlgorithm class
-            from .feed_algorithm import FeedAlgorithm
-            posts = FeedAlgorithm.get_trending_posts(request.user)
+            post_ids = FeedAlgorithm.get_trending_post_ids()
         else:
-            from .feed_algorithm import FeedAlgorithm
-            posts = FeedAlgorithm.get_personalized_feed(request.user)
+            post_ids = FeedAlgorithm.get_personalized_feed_ids(request.user)
         
         # Paginate results
         paginator = PageNumberPagination()
         paginator.page_size = 20
-        result_page = paginator.paginate_queryset(posts, request)
+        page_ids = paginator.paginate_queryset(post_ids, request)
         
-        serializer = PostSerializer(
-            result_page,
+        # Only the posts on this page are loaded
+        serializer = PostListSerializer(
+            FeedAlgorithm.load_posts(page_ids, request.user),
             many=True,
             context={'request': request}
         )
         
-        return paginator.get_paginated_response(serializer.data)
\ No newline at end of file
+        return paginator.get_paginated_response(serializer.data)
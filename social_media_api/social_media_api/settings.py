@@ -74,6 +74,28 @@ DATABASES = {
     )
 }
 
+# Cache - Redis when REDIS_URL is set, so every Gunicorn worker shares the token,
+# session and count caches; otherwise a per-process local-memory cache
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+    # Sessions (admin, browsable API) are read from Redis instead of a DB query per
+    # request, and written through to the database so an eviction or restart keeps them
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    SESSION_CACHE_ALIAS = 'default'
+
+# Tokens are only cached when the cache is shared; with a per-process cache a
+# logout or deactivation would not reach the other workers' copies
+TOKEN_AUTHENTICATION_CLASS = (
+    'accounts.authentication.CachedTokenAuthentication' if REDIS_URL
+    else 'rest_framework.authentication.TokenAuthentication'
+)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -110,7 +132,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        TOKEN_AUTHENTICATION_CLASS,
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [